@@ -2,13 +2,18 @@
 # 2021-09-19
 
 from Maze.structs import *
+from Maze.capture import FrameWriter, GifWriter
+import Maze.instrument as instrument
+from Maze.playback import Playback
 import sys, os
 import random
+import heapq
 import pygame
 from pygame.locals import *
-from itertools import product
-from copy import deepcopy
+from itertools import product, islice
 from collections import deque
+from array import array
+from functools import lru_cache
 
 
 CELLSIZE = 20
@@ -42,10 +47,29 @@ HEAD_color = (0, 250, 246)
 TEXT_color = (0, 250, 246)
 TEXT_BOX_color = (20, 20, 20)
 
+# text rendering
+FONT_FILE = 'gomarice_no_continue.ttf'
+GRADIENT_STEPS = 64    # colors a coloring message steps through
+TEXT_CACHE_SIZE = 2 * GRADIENT_STEPS   # rendered texts kept in memory
+
 # running options
 CAPDIR = './capture/'
-ALG_FUNC = {0: 'view_settings()', 1: 'run_DFS()', 2: 'run_prim()'}
-ALG_TITLE = {0: f'Grid setting ({X_CELLS} + {Y_CELLS})', 1: 'Depth-First Search', 2: 'Prims Algorithm'}
+CAPTURE_FORMAT = 'png'     # 'png', 'bmp', 'tga', 'gif' (one animation) or None to disable capture
+CAPTURE_COMPRESSION = 1    # zlib level of png captures, 0 - 9
+CAPTURE_WORKERS = 2        # threads encoding captured frames
+SEED = None    # seed of the random generators, None for a new maze every run
+COMPACT_MAZE = False    # store the maze as a GridMaze (one byte per cell)
+INSTRUMENT = False     # print phase timers and counters at the end of a run
+INSTRUMENT_FILE = None    # also export them to this JSON file
+PROFILE_FILE = None    # profile the run with cProfile and write the stats to this file for pstats
+PLAYBACK_SECONDS = None    # target duration of each playback, steps are batched per frame to meet it
+PLAYBACK_FRAMES = None     # most frames rendered by each playback, None for one frame per step
+GROWING_POLICY = 'mixed'   # cell selection of the growing tree: 'random', 'newest', 'oldest' or 'mixed'
+ALG_FUNC = {0: 'view_settings()', 1: 'run_DFS()', 2: 'run_prim()', 3: 'run_kruskal()', 4: 'run_eller()',
+            5: 'run_growing_tree()'}
+ALG_GEN = {1: 'random_dfs', 2: 'prim', 3: 'kruskal', 4: 'eller_maze', 5: 'growing'}    # generators for headless runs
+ALG_TITLE = {0: f'Grid setting ({X_CELLS} + {Y_CELLS})', 1: 'Depth-First Search', 2: 'Prims Algorithm',
+             3: 'Kruskals Algorithm', 4: 'Ellers Algorithm', 5: f'Growing Tree ({GROWING_POLICY})'}
 
 
 # ----- Subroutines for rendering objects -----
@@ -59,15 +83,25 @@ def in_canvas(vect):
     return X_inside and Y_inside
 
 
-def possible_neighbors(vect):
-    '''enumerates valid possible neighbors of a Vector.'''
+def cell_step(maze):
+    '''Distance between the centers of adjacent cells of a maze.'''
+
+    return maze.cellsize if isinstance(maze, GridMaze) else CELLSIZE
+
 
-    N_1 = Vector(vect.x + CELLSIZE, vect.y)
-    N_2 = Vector(vect.x - CELLSIZE, vect.y)
-    N_3 = Vector(vect.x, vect.y + CELLSIZE)
-    N_4 = Vector(vect.x, vect.y - CELLSIZE)
+def possible_neighbors(vect, maze = None):
+    '''enumerates valid possible neighbors of a Vector. When a maze
+    is given, neighbors are the ones inside that maze instead of the
+    canvas.'''
 
-    return list(filter(in_canvas, [N_1, N_2, N_3, N_4]))
+    step = CELLSIZE if maze is None else cell_step(maze)
+    N_1 = Vector(vect.x + step, vect.y)
+    N_2 = Vector(vect.x - step, vect.y)
+    N_3 = Vector(vect.x, vect.y + step)
+    N_4 = Vector(vect.x, vect.y - step)
+
+    inside = in_canvas if maze is None else maze.has_node
+    return list(filter(inside, [N_1, N_2, N_3, N_4]))
 
 
 def draw_centers():
@@ -78,15 +112,18 @@ def draw_centers():
         pygame.draw.rect(screen, (58, 159, 41), (x - OFFSET, y - OFFSET, SIZESQ, SIZESQ))
 
 
-def draw_corridor(cell_1, cell_2, color = CORRIDOR_Color):
-    '''draw a corridor connecting two cells.'''
+def draw_corridor(cell_1, cell_2, color = CORRIDOR_Color, surface = None):
+    '''draw a corridor connecting two cells, on the screen unless
+    another surface is given.'''
+
+    surface = screen if surface is None else surface
 
     x_positions = [cell_1.x, 0.5 * (cell_1.x + cell_2.x), cell_2.x]
     y_positions = [cell_1.y, 0.5 * (cell_1.y + cell_2.y), cell_2.y]
 
     for X, Y in zip(x_positions, y_positions):
         corridor = pygame.Rect(X - OFFSET, Y -OFFSET, SIZESQ, SIZESQ)
-        pygame.draw.rect(screen, color, corridor)
+        pygame.draw.rect(surface, color, corridor)
 
 
 def in_draw_referent(node):
@@ -104,22 +141,55 @@ def draw_maze_nodes(frame):
     '''Render the current status of a maze by drawing channels
     between connected nodes on a frame.'''
 
-    drawing_nodes = [node for node in frame.maze.nodes if in_draw_referent(node)]
+    maze = frame.maze
+    if isinstance(maze, GridMaze):
+        # walk the passage bits, without building Nodes
+        for i in range(len(maze.cells)):
+            row, col = divmod(i, maze.width)
+            if (row + col) % 2:
+                for j in maze.passages(i):
+                    draw_corridor(maze.vector(i), maze.vector(j))
+    else:
+        drawing_nodes = [node for node in maze.nodes if in_draw_referent(node)]
+
+        for node in drawing_nodes:
+            for neighbor in node.neighbors:
+                draw_corridor(node.current, neighbor)
+
+    draw_head(frame.head)
+
+
+def draw_head(vect, surface = None):
+    '''draw the cell leading the generation.'''
+
+    surface = screen if surface is None else surface
+
+    head = pygame.Rect(vect.x - OFFSET, vect.y - OFFSET, SIZESQ, SIZESQ)
+    pygame.draw.rect(surface, HEAD_color, head)
+
+
+FONTS = {}    # loaded fonts, keyed by size
+
+def get_font(size: int):
+    '''Return the font of a given size, loading it only once.'''
+
+    font = FONTS.get(size)
+    if font is None:
+        font = FONTS[size] = pygame.font.Font(FONT_FILE, size)
+    return font
+
 
-    for node in drawing_nodes:
-        for neighbor in node.neighbors:
-            draw_corridor(node.current, neighbor)
+@lru_cache(maxsize = TEXT_CACHE_SIZE)
+def render_text(message: str, size: int, color: tuple):
+    '''Return the surface of a rendered text, reusing recent ones.'''
+
+    return get_font(size).render(message, True, color, BG_SCREEN)
 
-    X, Y = frame.head.x, frame.head.y
-    head = pygame.Rect(X - OFFSET, Y - OFFSET, SIZESQ, SIZESQ)
-    pygame.draw.rect(screen, HEAD_color, head)
-            
 
 def show_message(message: str, display = False, size: int = int(X_CELLS/12 * CELLSIZE), color = TEXT_color):
     '''Subroutine for displaying a message.'''
 
-    font = pygame.font.Font('gomarice_no_continue.ttf', size)
-    title_text = font.render(message, True, color, BG_SCREEN)
+    title_text = render_text(message, size, tuple(color))
     text_rect = title_text.get_rect()
 
     text_box = pygame.Rect(MARGIN_X, BG_HEIGHT - MARGIN_Y // 2, MAZEWIDTH, 2 * CELLSIZE)
@@ -136,10 +206,13 @@ def show_coloring_message(message: str, iterations: int, current: int, size: int
     current = current + 1
 
     GREEN_MAX = 255
-    GREEN = GREEN_1 + (GREEN_MAX / (iterations)) * current
+    GREEN = min(GREEN_1 + (GREEN_MAX / (iterations)) * current, GREEN_MAX)
+
+    # quantized so the rendered text of each step can be reused
+    level = round(GREEN / GREEN_MAX * (GRADIENT_STEPS - 1))
+    GREEN = round(level * GREEN_MAX / (GRADIENT_STEPS - 1))
 
-    font = pygame.font.Font('gomarice_no_continue.ttf', size)
-    title_text = font.render(message, True, (255, GREEN, 0), BG_SCREEN)
+    title_text = render_text(message, size, (255, GREEN, 0))
     text_rect = title_text.get_rect()
 
     text_box = pygame.Rect(MARGIN_X, BG_HEIGHT - MARGIN_Y // 2, MAZEWIDTH, 2 * CELLSIZE)
@@ -147,6 +220,39 @@ def show_coloring_message(message: str, iterations: int, current: int, size: int
     screen.blit(title_text, (BG_WIDTH/ 2 - text_rect.width / 2, BG_HEIGHT - MARGIN_Y * 1.5))
 
 
+def retro_palette():
+    '''Fixed palette of the colors rendered on screen, used to write
+    GIF captures without quantizing each frame.'''
+
+    palette = [BG_SCREEN, BG_MAZE, CORRIDOR_Color, HEAD_color, TEXT_color, TEXT_BOX_color]
+
+    for level in range(GRADIENT_STEPS):
+        GREEN = round(level * 255 / (GRADIENT_STEPS - 1))
+        palette.append((255, GREEN, 0))          # coloring messages
+        palette.append((255 - GREEN, GREEN, 35))  # solution path
+
+    for level in range(1, 32):    # antialiased text over the background
+        palette.append(tuple(level * c // 32 for c in TEXT_color))
+
+    return list(dict.fromkeys(palette))
+
+
+def gif_delay(fps):
+    '''Centiseconds a GIF frame is shown to play at fps, 2 is the
+    shortest most viewers honor.'''
+
+    return max(2, 100 // fps) if fps else 2
+
+
+def save_frame(name: str, fps = None):
+    '''Subroutine for capturing the screen into CAPDIR, the image is
+    written in the background. Animations show the frame for 1 / fps
+    seconds, FPS by default.'''
+
+    if writer:
+        writer.save(screen, CAPDIR + name, gif_delay(FPS if fps is None else fps))
+
+
 # ----- Subroutines for controlling gameflow -----
 
 def view_settings():
@@ -183,34 +289,72 @@ def mainloop(algorithm):
     '''Subroutine for running algorithms'''
 
     resolution = (BG_WIDTH, BG_HEIGHT)
-    global clock, screen
+    global clock, screen, writer
 
     pygame.init()
     screen = pygame.display.set_mode(resolution, DOUBLEBUF)
     pygame.display.set_caption(ALG_TITLE[algorithm])
     clock = pygame.time.Clock()
 
-    while True:
-        os.mkdir(CAPDIR)
-        last_frame = eval(ALG_FUNC[algorithm])    # calls algorithm
-
-        if last_frame:
-            show_message('Searching way out...', True)
-            pygame.image.save(screen, './capture/maze_final.png')
-            pygame.time.delay(PAUSETIME_MIDDLE)
-            run_astar(last_frame)
-            show_message('SOLVED !!!', True)
-            pygame.image.save(screen, './capture/path_final.png')
-
-        pygame.time.delay(PAUSETIME_END)
-        pygame.quit()
-        sys.exit()
-
-
-def create_maze():
-    '''Subroutine for creating a maze with its nodes.'''
+    if SEED is not None:
+        random.seed(SEED)
+
+    writer = None
+    if CAPTURE_FORMAT == 'gif':
+        writer = GifWriter(CAPDIR + 'maze.gif', retro_palette(), gif_delay(FPS))
+    elif CAPTURE_FORMAT:
+        writer = FrameWriter(CAPTURE_FORMAT, CAPTURE_COMPRESSION, CAPTURE_WORKERS)
+
+    if INSTRUMENT:
+        instrument.enable()
+    if PROFILE_FILE:
+        instrument.start_profile()
+
+    try:
+        while True:
+            os.mkdir(CAPDIR)
+            with instrument.phase('playback'):
+                last_frame = eval(ALG_FUNC[algorithm])    # calls algorithm
+
+            if last_frame:
+                show_message('Searching way out...', True)
+                save_frame('maze_final')
+                pygame.time.delay(PAUSETIME_MIDDLE)
+                with instrument.phase('playback'):
+                    run_astar(last_frame)
+                show_message('SOLVED !!!', True)
+                save_frame('path_final')
+
+            if writer:
+                with instrument.phase('capture'):
+                    writer.close()    # wait for pending captures
+
+            if PROFILE_FILE:
+                instrument.stop_profile(PROFILE_FILE)
+            if INSTRUMENT:
+                instrument.print_summary()
+                if INSTRUMENT_FILE:
+                    instrument.export(INSTRUMENT_FILE)
+
+            pygame.time.delay(PAUSETIME_END)
+            pygame.quit()
+            sys.exit()
+    finally:
+        if writer:
+            writer.close()    # keep the pending captures when the window is closed
+
+
+def create_maze(compact = False):
+    '''Subroutine for creating a maze with its nodes. A compact
+    maze is a GridMaze laid out on the same grid.'''
 
     print('Creating maze...')
+    if compact:
+        origin = Vector(MARGIN_X + CELLSIZE // 2, MARGIN_Y + CELLSIZE // 2)
+        maze = GridMaze(X_CELLS, Y_CELLS, origin, CELLSIZE)
+        print(f'Maze size: {MAZEWIDTH} * {MAZEHEIGHT}\n')
+        return maze
+
     maze = Maze()
 
     for X, Y in product(X_GRID, Y_GRID):
@@ -223,54 +367,28 @@ def create_maze():
     return maze
 
 
-# ----- Subroutines for algorithms -----
-
-def dfs(start, maze, unvisited, frames):
-    '''Subroutine for creating the maze recursively and marking
-    each connected node.'''
+def play_generation(maze, events):
+    '''Subroutine for rendering the carve events of a generator as
+    they are produced, several per frame when the playback has a
+    budget. Returns the last frame.'''
 
-    if unvisited == []:
-        return frames
+    max_frames = X_CELLS * Y_CELLS   # one event per cell
 
-    neighbors = [N for N in possible_neighbors(start)]
-    random.shuffle(neighbors)
-
-    for new_start in neighbors:
-        if maze.is_visited(new_start):
-            continue
-        else:
-            maze.set_connected(start, new_start)
-            maze.set_visited(new_start)
-            unvisited.remove(new_start)
-            frames.append(Frame(new_start, deepcopy(maze)))
-            is_full = dfs(new_start, maze, unvisited, frames)
-            if is_full:
-                return is_full
-            else:
-                continue
-
-
-def run_DFS():
-    '''Subroutine for creating a maze and run depth-first search.'''
-
-    maze = create_maze()
-    unvisited = [node.current for node in maze.nodes]
-
-    start = random.choice(unvisited)
-    maze.set_visited(start)
-    unvisited.remove(start)
-
-    frames = [Frame(start, deepcopy(maze))]
-
-    print('Generating frames... this might take a few seconds')
-    frames = dfs(start, maze, unvisited, frames)
-
-    cur_f = 0    # initialize frame
-    max_frames = len(frames)
-    current_frame = frames[cur_f]
+    # persistent image of the maze, each event only adds its corridor
+    screen.fill(BG_SCREEN)
+    pygame.draw.rect(screen, BG_MAZE, (MARGIN_X, MARGIN_Y, MAZEWIDTH, MAZEHEIGHT))
+    canvas = screen.copy()
+    canvas_bytes = canvas.get_pitch() * canvas.get_height()    # copied by every blit
+    events = iter(instrument.timed(events, 'generation'))
+    played = 0
+    head = maze.vector(0) if isinstance(maze, GridMaze) else maze.nodes[0].current    # until a cell is carved
 
     print(f'Playing back at {FPS} fps...\n')
-    while True:
+    for cur_f, size in enumerate(Playback(max_frames, PLAYBACK_SECONDS, PLAYBACK_FRAMES, FPS)):
+        batch = list(islice(events, size))
+        if not batch:
+            break
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
@@ -280,92 +398,299 @@ def run_DFS():
                     pygame.quit()
                     sys.exit()
 
-        screen.fill(BG_SCREEN)
-        pygame.draw.rect(screen, BG_MAZE, (MARGIN_X, MARGIN_Y, MAZEWIDTH, MAZEHEIGHT))
-        draw_maze_nodes(current_frame)
-        show_coloring_message('CREATING MAZE...', max_frames, cur_f)
+        for head, parent in batch:
+            if parent is not None:
+                draw_corridor(parent, head, surface = canvas)
+        played += len(batch)
+
+        screen.blit(canvas, (0, 0))
+        if instrument.ENABLED:
+            instrument.count('bytes copied', canvas_bytes)
+        draw_head(head)
+        show_coloring_message('CREATING MAZE...', max_frames, played - 1)
 
         pygame.display.update()
-        pygame.image.save(screen, './capture/maze_%04d.png' % (cur_f + 1))
+        save_frame('maze_%04d' % (cur_f + 1))
         clock.tick(FPS)
 
-        cur_f +=1
+    return Frame(head, maze)
+
 
-        if cur_f == max_frames:
-            return current_frame
+# ----- Subroutines for algorithms -----
+
+def dfs(start, maze):
+    '''Generator creating the maze depth-first from start, marking
+    each connected node. Yields (cell, parent) for every carved cell.
+    Uses an explicit stack instead of recursion, so the depth of the
+    search is not bounded by the recursion limit.'''
+
+    def shuffled_neighbors(vect):
+        neighbors = possible_neighbors(vect, maze)
+        random.shuffle(neighbors)
+        return iter(neighbors)
+
+    stack = [(start, shuffled_neighbors(start))]   # cells being explored
+
+    while stack:
+        current, neighbors = stack[-1]
+        for new_start in neighbors:
+            if not maze.is_visited(new_start):
+                maze.set_connected(current, new_start)
+                maze.set_visited(new_start)
+                yield new_start, current
+                stack.append((new_start, shuffled_neighbors(new_start)))
+                break
         else:
-            current_frame = frames[cur_f]
+            stack.pop()    # dead end, backtrack
 
 
-def prim(maze):
+def run_DFS():
+    '''Subroutine for creating a maze and run depth-first search.'''
+
+    maze = create_maze(COMPACT_MAZE)
+    return play_generation(maze, random_dfs(maze))
+
 
-    unvisited = [node.current for node in maze.nodes]
-    heads = []   # cells heading the expansion
-    frames = []
+def random_cell(maze):
+    '''Position of a random cell of a maze.'''
 
-    start_x = random.choice(X_GRID) + CELLSIZE // 2
-    start_y = random.choice(Y_GRID) + CELLSIZE // 2
-    start = Vector(start_x, start_y)
+    if isinstance(maze, GridMaze):
+        return maze.vector(random.randrange(len(maze.cells)))
+    return random.choice(maze.nodes).current
 
+
+def random_dfs(maze):
+    '''Generator running dfs from a random cell. Yields (cell, parent)
+    for every carved cell, starting with (start, None).'''
+
+    start = random_cell(maze)
     maze.set_visited(start)
-    heads.append(start)
-    unvisited.remove(start)
 
-    frames.append(Frame(start, deepcopy(maze)))
+    yield start, None
+    yield from dfs(start, maze)
 
-    while unvisited != []:
-        head = random.choice(heads)
-        neighbors = possible_neighbors(head)
-        random.shuffle(neighbors)
-        for neighbor in neighbors:
-            if not maze.is_visited(neighbor):
-                maze.set_visited(neighbor)
-                heads.append(neighbor)
-                unvisited.remove(neighbor)
-                maze.set_connected(head, neighbor)
-                frames.append(Frame(neighbor, deepcopy(maze)))
-                break    # don't continue with the others heads neighbors
 
-    return frames
+# policies of growing_tree: pick an index between first and last active cells
+GROWING_POLICIES = {
+    'random': lambda first, last: random.randint(first, last),    # Prim
+    'newest': lambda first, last: last,                           # depth-first
+    'oldest': lambda first, last: first,
+    'mixed': lambda first, last: last if random.random() < 0.5 else random.randint(first, last),
+}
+
+
+def growing_tree(maze, start, policy = 'random'):
+    '''Generator creating the maze with the growing tree algorithm:
+    an active cell chosen by policy (a name of GROWING_POLICIES or a
+    function of the first and last active indices) carves towards a
+    random unvisited neighbor, and is dropped once it has none. Yields
+    (cell, parent) for every carved cell, starting with (start, None).
+    Dead cells are dropped in O(1): swapped with the last one for the
+    random policy, otherwise replaced by None (picks landing on them
+    are drawn again) so active stays ordered from oldest to newest.'''
+
+    select = GROWING_POLICIES[policy] if isinstance(policy, str) else policy
+    unordered = policy == 'random'
+
+    active = [start]    # cells heading the expansion are active[first:], the ends are never None
+    first = 0
+    dropped = 0    # None entries left in active[first:]
+
+    maze.set_visited(start)
+    yield start, None
+
+    while first < len(active):
+        i = select(first, len(active) - 1)
+        head = active[i]
+        if head is None:
+            continue
+
+        neighbors = [N for N in possible_neighbors(head, maze) if not maze.is_visited(N)]
+        if neighbors:
+            neighbor = random.choice(neighbors)
+            maze.set_visited(neighbor)
+            maze.set_connected(head, neighbor)
+            active.append(neighbor)
+            yield neighbor, head
+            continue
+
+        if unordered and i != first:
+            last = active.pop()    # swap and pop
+            if i < len(active):
+                active[i] = last
+            continue
+
+        active[i] = None
+        dropped += 1
+        while active and active[-1] is None:
+            active.pop()
+            dropped -= 1
+        while first < len(active) and active[first] is None:
+            first += 1
+            dropped -= 1
+
+        if first > 1024 and 2 * first > len(active):
+            del active[:first]
+            first = 0
+        if dropped > 1024 and 2 * dropped > len(active) - first:
+            active = [cell for cell in active[first:] if cell is not None]
+            first = dropped = 0
+
+
+def prim(maze):
+    '''Generator creating the maze by expanding random heads, the
+    random policy of growing_tree. Yields (cell, parent) for every
+    carved cell, starting with (start, None).'''
+
+    yield from growing_tree(maze, random_cell(maze), 'random')
 
 
 def run_prim():
 
-    maze = create_maze()
+    maze = create_maze(COMPACT_MAZE)
+    return play_generation(maze, prim(maze))
 
-    print('Generating frames. This will take a wile...')
-    frames = prim(maze)
 
-    cur_f = 0  # initialize frame
-    max_frames = len(frames)
-    current_frame = frames[cur_f]
+def kruskal(maze):
+    '''Generator creating the maze with randomized Kruskal: walls are
+    visited in random order and removed when they separate two sets of
+    a DisjointSet. Yields (cell, parent) for every carved passage.'''
 
-    print(f'Playing back at {FPS} fps...\n')
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
+    if isinstance(maze, GridMaze):
+        size, position, locate = len(maze.cells), maze.vector, maze.cell
+    else:
+        cells = maze.vectors()
+        index = {Maze.key(vect): i for i, vect in enumerate(cells)}
+        size, position = len(cells), cells.__getitem__
+        locate = lambda vect: index.get(Maze.key(vect))
+    step = cell_step(maze)
 
-        screen.fill(BG_SCREEN)
-        pygame.draw.rect(screen, BG_MAZE, (MARGIN_X, MARGIN_Y, MAZEWIDTH, MAZEHEIGHT))
-        draw_maze_nodes(current_frame)
-        show_coloring_message('CREATING MAZE...', max_frames, cur_f)
+    def wall(edge):
+        # edge 2 * i is the wall to the right of cell i, 2 * i + 1 the one below
+        vect = position(edge // 2)
+        if edge % 2:
+            return vect, Vector(vect.x, vect.y + step)
+        return vect, Vector(vect.x + step, vect.y)
 
-        pygame.display.update()
-        pygame.image.save(screen, './capture/maze_%04d.png' % (cur_f + 1))
-        clock.tick(FPS)
+    edges = array('q', (edge for edge in range(2 * size) if locate(wall(edge)[1]) is not None))
+    random.shuffle(edges)
+
+    sets = DisjointSet(size)
+    for edge in edges:
+        parent, head = wall(edge)
+        if sets.union(edge // 2, locate(head)):
+            maze.set_visited(parent)
+            maze.set_visited(head)
+            maze.set_connected(parent, head)
+            yield head, parent
+
+
+def growing(maze):
+    '''Generator running growing_tree with GROWING_POLICY from a
+    random cell.'''
+
+    yield from growing_tree(maze, random_cell(maze), GROWING_POLICY)
+
+
+def run_growing_tree():
 
-        cur_f += 1
+    maze = create_maze(COMPACT_MAZE)
+    return play_generation(maze, growing(maze))
 
-        if cur_f == max_frames:
-            return current_frame
-        else:
-            current_frame = frames[cur_f]
+
+def run_kruskal():
+
+    maze = create_maze(COMPACT_MAZE)
+    return play_generation(maze, kruskal(maze))
+
+
+def eller(width, rows = None):
+    '''Generator of the rows of a maze made with Eller's algorithm,
+    rows = None streams rows endlessly. Only the set labels of the
+    current row are kept, so memory is O(width). Every row is a
+    bytearray with the passage bits of its cells, as GridMaze.cells.'''
+
+    labels = [None] * width    # set of each cell, None for new cells
+    above = bytearray(width)   # cells opened towards the previous row
+
+    r = 0
+    while rows is None or r < rows:
+        last = rows is not None and r == rows - 1
+        row = bytearray(NORTH if bits & SOUTH else 0 for bits in above)
+
+        # give new sets to cells not joined from above, labels stay below width
+        used = {label for label in labels if label is not None}
+        free = (label for label in range(width) if label not in used)
+        labels = [next(free) if label is None else label for label in labels]
+
+        # join adjacent cells of different sets
+        sets = DisjointSet(width)
+        for c in range(width - 1):
+            if sets.find(labels[c]) != sets.find(labels[c + 1]) and (last or random.random() < 0.5):
+                sets.union(labels[c], labels[c + 1])
+                row[c] |= EAST
+                row[c + 1] |= WEST
+        labels = [sets.find(label) for label in labels]
+
+        # open at least one cell of every set towards the next row
+        if not last:
+            members = {}
+            for c, label in enumerate(labels):
+                members.setdefault(label, []).append(c)
+            for cells in members.values():
+                down = [c for c in cells if random.random() < 0.5] or [random.choice(cells)]
+                for c in down:
+                    row[c] |= SOUTH
+            labels = [label if bits & SOUTH else None for label, bits in zip(labels, row)]
+
+        above = row
+        yield row
+        r += 1
+
+
+def save_rows(path, rows):
+    '''Write streamed rows to a file as they are produced. The file
+    holds the cells row-major, like GridMaze.cells. Returns the number
+    of rows written.'''
+
+    count = 0
+    with open(path, 'wb') as output:
+        for row in rows:
+            output.write(row)
+            count += 1
+    return count
+
+
+def eller_maze(maze):
+    '''Generator carving a blank maze row by row with eller. Yields
+    (cell, parent) for every carved passage.'''
+
+    if isinstance(maze, GridMaze):
+        origin, width, height = maze.origin, maze.width, maze.height
+    else:
+        origin, width, height = maze.nodes[0].current, X_CELLS, Y_CELLS
+    step = cell_step(maze)
+
+    for r, row in enumerate(eller(width, height)):
+        for c, bits in enumerate(row):
+            cell = Vector(origin.x + c * step, origin.y + r * step)
+            maze.set_visited(cell)
+            if bits & EAST:
+                right = Vector(cell.x + step, cell.y)
+                maze.set_visited(right)
+                maze.set_connected(cell, right)
+                yield right, cell
+            if bits & SOUTH:
+                below = Vector(cell.x, cell.y + step)
+                maze.set_visited(below)
+                maze.set_connected(cell, below)
+                yield below, cell
+
+
+def run_eller():
+
+    maze = create_maze(COMPACT_MAZE)
+    return play_generation(maze, eller_maze(maze))
 
 
 # ----- A* Search -----
@@ -380,27 +705,45 @@ def manhattan(vect_1, vect_2):
     return (x_dist + y_dist)
 
 
-def astar(maze, start, current, end, visited, path):
-    '''Subroutine to apply A star algorithm to find the maze path.'''
-
-    if current == end:
-        return visited, path
+def astar(maze, start, end):
+    '''Subroutine to apply A star algorithm to find the maze path.
+    Returns the expanded cells in order and the path from start to
+    end, the path is None if end cannot be reached.'''
 
-    choices = [C for C in maze.get_neighbors(current) if C not in visited]
+    key = lambda vect: (vect.x, vect.y)   # Vector is unhashable
 
-    choices.sort(key = lambda c: manhattan(start, c))
-    choices.sort(key = lambda c: manhattan(c, end))
+    g_cost = {key(start): 0}
+    parents = {key(start): None}
+    closed = set()
+    visited = []
 
-    for next_move in choices:
+    count = 0    # tie breaker, keeps the heap from comparing Vectors
+    open_set = [(manhattan(start, end), count, start)]
 
-        visited.append(next_move)
-        path.append(next_move)
-        visited_final, path_final = astar(maze, start, next_move, end, visited, path)
-
-        if path_final is not None:
-            return visited_final, path_final
-        else:
-            path.pop()
+    while open_set:
+        _, _, current = heapq.heappop(open_set)
+        current_key = key(current)
+        if current_key in closed:
+            continue
+        closed.add(current_key)
+        visited.append(current)
+
+        if current == end:
+            path = deque()
+            while current is not None:
+                path.appendleft(current)
+                current = parents[key(current)]
+            return visited, path
+
+        for next_move in maze.get_neighbors(current):
+            next_key = key(next_move)
+            cost = g_cost[current_key] + manhattan(current, next_move)
+            if next_key in closed or cost >= g_cost.get(next_key, cost + 1):
+                continue
+            g_cost[next_key] = cost
+            parents[next_key] = current
+            count += 1
+            heapq.heappush(open_set, (cost + manhattan(next_move, end), count, next_move))
 
     return visited, None
 
@@ -409,14 +752,15 @@ def run_astar(frame):
 
     maze = frame.maze
 
-    start = maze.nodes[0].current  #top left
-    end = maze.nodes[-1].current   #bottom right
-
-    current = start
-    visited, path = [start], deque([start])
+    if isinstance(maze, GridMaze):
+        start, end = maze.vector(0), maze.vector(len(maze.cells) - 1)
+    else:
+        start = maze.nodes[0].current  #top left
+        end = maze.nodes[-1].current   #bottom right
 
     print("Using A* Search...\n")
-    visited, path = astar(maze, start, current, end, visited, path)
+    with instrument.phase('solve'):
+        visited, path = astar(maze, start, end)
 
     len_path = len(path)
     render_path = []
@@ -425,18 +769,17 @@ def run_astar(frame):
         render_path.append([path[i], path[i+1]])
 
 
-    cur_f = 0    # initialize frame
-    max_frames = len(render_path) + 1
-    path_frame = render_path[:cur_f]
+    max_frames = len(render_path) + 1    # the path grows by one corridor per step
+    shown = 0
 
-    coloring_factor = (len_path*(len_path-1))/2   # number of iterations in which the color would be modified
-    RED = 255
-    RED_min = 0
-    GREEN = 0
+    # every corridor drawn fades the color of the next one, as if each step had its own frame
+    coloring_factor = max(1, (len_path*(len_path-1))/2)   # number of iterations in which the color would be modified
+    RED_max = 255
     GREEN_max = 255
+    keep = 1 - 1 / coloring_factor
 
     print(f'Playing back at {FPS} fps...')
-    while True:
+    for cur_f, size in enumerate(Playback(max_frames, PLAYBACK_SECONDS, PLAYBACK_FRAMES, FPS // 2)):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
@@ -446,8 +789,11 @@ def run_astar(frame):
                     pygame.quit()
                     sys.exit()
 
+        shown = min(shown + size, max_frames)
+        path_frame = render_path[:shown - 1]
+
         sys.stdout.write('\r')
-        sys.stdout.write('Current frame: %d/%d' % (cur_f + 1, max_frames))
+        sys.stdout.write('Current frame: %d/%d' % (shown, max_frames))
         sys.stdout.flush()
 
         screen.fill(BG_SCREEN)
@@ -455,21 +801,19 @@ def run_astar(frame):
         show_message('SOLVING...', False)
         draw_maze_nodes(frame)
 
+        fade = keep ** (len(path_frame) * (len(path_frame) - 1) // 2)    # corridors drawn by the previous steps
         for node in path_frame:
+            RED, GREEN = RED_max * fade, GREEN_max - GREEN_max * fade
             draw_corridor(node[0], node[1], (RED, GREEN, 35))
-            RED -= abs(RED - RED_min) / coloring_factor
-            GREEN += abs(GREEN - GREEN_max) /coloring_factor
+            fade *= keep
 
         pygame.display.update()
-        pygame.image.save(screen, './capture/path_%04d.png' % (cur_f + 1))
+        save_frame('path_%04d' % (cur_f + 1), FPS // 2)
         clock.tick(FPS//2)
 
-        cur_f += 1  # update frame
-        if cur_f == max_frames:
+        if shown == max_frames:
             print('\n')
             return
-        else:
-            path_frame = render_path[:cur_f]
 
 
 
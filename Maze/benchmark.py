@@ -0,0 +1,211 @@
+# Subroutines for timing generators and solvers over grid sizes
+# 2026-10-18
+
+import Maze.algorithms as algorithms
+from Maze.structs import *
+from Maze.headless import new_grid, generate
+from Maze.distance import flood_fill
+from Maze.lca import build_index
+import sys
+import gc
+import io
+import time
+import random
+import platform
+import statistics
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, redirect_stdout
+
+try:
+    import numpy
+except ImportError:    # the NumPy generators and rasterize are not benchmarked
+    numpy = None
+
+
+SIZES = (16, 32, 64, 128)    # cells per side of the square grids swept by default
+REPEATS = 3
+SEED = 2021
+BATCH = 16    # mazes per call of the NumPy batch generators
+THRESHOLD = 0.2    # relative slowdown or memory growth reported as a regression
+
+
+@contextmanager
+def grid_size(x_cells, y_cells):
+    '''Temporarily resize the canvas grid of Maze.algorithms, used by
+    create_maze and the generators working on Mazes of Nodes.'''
+
+    names = ('X_CELLS', 'Y_CELLS', 'MAZEWIDTH', 'MAZEHEIGHT', 'MARGIN_X', 'MARGIN_Y', 'X_GRID', 'Y_GRID')
+    saved = {name: getattr(algorithms, name) for name in names}
+
+    cellsize = algorithms.CELLSIZE
+    width, height = cellsize * x_cells, cellsize * y_cells
+    margin_x, margin_y = 4 * x_cells, 2 * y_cells
+    values = (x_cells, y_cells, width, height, margin_x, margin_y,
+              range(margin_x, width + margin_x, cellsize), range(margin_y, height + margin_y, cellsize))
+    try:
+        for name, value in zip(names, values):
+            setattr(algorithms, name, value)
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(algorithms, name, value)
+
+
+# ----- Benchmarks -----
+# each benchmark is a setup function (x_cells, y_cells, seed) -> run,
+# only the call of run is measured; setup.mazes is the number of mazes
+# a run produces when it is not 1
+
+def creating(compact):
+    def setup(x_cells, y_cells, seed):
+        return lambda: algorithms.create_maze(compact)
+    return setup
+
+
+def generating(name, compact):
+    def setup(x_cells, y_cells, seed):
+        random.seed(seed)
+        maze = new_grid(x_cells, y_cells) if compact else algorithms.create_maze(False)
+        generator = getattr(algorithms, name)
+        return lambda: deque(generator(maze), maxlen = 0)
+    return setup
+
+
+def solving(solver):
+    def setup(x_cells, y_cells, seed):
+        maze = generate(x_cells, y_cells, 2, seed)
+        start, end = maze.vector(0), maze.vector(len(maze.cells) - 1)
+        return lambda: solver(maze, start, end)
+    return setup
+
+
+def streaming(x_cells, y_cells, seed):
+    # rows of eller, without a maze to carve
+    random.seed(seed)
+    return lambda: deque(algorithms.eller(x_cells, y_cells), maxlen = 0)
+
+
+def batching(name):
+    def setup(x_cells, y_cells, seed):
+        import Maze.vectorized as vectorized
+        generator = getattr(vectorized, name)
+        return lambda: generator(BATCH, y_cells, x_cells, seed)
+    setup.mazes = BATCH
+    return setup
+
+
+def rendering(x_cells, y_cells, seed):
+    from Maze.raster import rasterize
+    maze = generate(x_cells, y_cells, 2, seed)
+    return lambda: rasterize(maze, 4)
+
+
+BENCHMARKS = {
+    'create_maze': creating(False),
+    'create_maze_compact': creating(True),
+    **{name: generating(name, False) for name in algorithms.ALG_GEN.values()},
+    **{name + '_compact': generating(name, True) for name in algorithms.ALG_GEN.values()},
+    'astar': solving(algorithms.astar),
+    'flood_fill': solving(lambda maze, start, end: flood_fill(maze, start).path(end)),
+    'build_index': solving(lambda maze, start, end: build_index(maze).path(start, end)),
+    'eller_rows': streaming,
+}
+
+if numpy is not None:
+    BENCHMARKS[f'binary_tree_x{BATCH}'] = batching('binary_tree')
+    BENCHMARKS[f'sidewinder_x{BATCH}'] = batching('sidewinder')
+    BENCHMARKS['rasterize'] = rendering
+
+
+def measure(setup, x_cells, y_cells, seed, repeats = REPEATS, memory = True):
+    '''Time repeats runs of a benchmark, each on a fresh setup, and
+    trace the peak memory allocated by one more run. Returns the
+    seconds of every run and the peak in bytes (None without memory).'''
+
+    times = []
+    with grid_size(x_cells, y_cells), redirect_stdout(io.StringIO()):
+        for _ in range(repeats):
+            run = setup(x_cells, y_cells, seed)
+            gc.collect()
+            t_0 = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - t_0)
+
+        peak = None
+        if memory:
+            run = setup(x_cells, y_cells, seed)
+            gc.collect()
+            tracemalloc.start()
+            try:
+                run()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+    return times, peak
+
+
+def run_benchmarks(names = None, sizes = SIZES, repeats = REPEATS, seed = SEED, memory = True, progress = None):
+    '''Run the benchmarks called names (all of BENCHMARKS by default)
+    on square grids of every size. Returns a JSON-ready report.'''
+
+    results = []
+    for name in names or BENCHMARKS:
+        for size in sizes:
+            setup = BENCHMARKS[name]
+            times, peak = measure(setup, size, size, seed, repeats, memory)
+            mazes = getattr(setup, 'mazes', 1)    # mazes produced per run
+            cells = mazes * size * size
+            result = {
+                'name': name,
+                'x_cells': size,
+                'y_cells': size,
+                'mazes': mazes,
+                'cells': cells,
+                'seconds_min': min(times),
+                'seconds_median': statistics.median(times),
+                'mazes_per_ms': mazes / (1e3 * min(times)),
+                'us_per_cell': 1e6 * min(times) / cells,
+                'peak_bytes': peak,
+                'bytes_per_cell': peak / cells if peak is not None else None,
+            }
+            results.append(result)
+            if progress:
+                progress(result)
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'repeats': repeats,
+        'results': results,
+    }
+
+
+def compare(report, baseline, threshold = THRESHOLD):
+    '''Regressions of a report against a baseline report: results of
+    the same benchmark and size whose best time or peak memory grew by
+    more than threshold. Returns (result, metric, ratio) tuples.'''
+
+    previous = {(r['name'], r['x_cells'], r['y_cells']): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        old = previous.get((result['name'], result['x_cells'], result['y_cells']))
+        if old is None:
+            continue
+        for metric in ('seconds_min', 'peak_bytes'):
+            if result[metric] is None or not old.get(metric):
+                continue
+            ratio = result[metric] / old[metric]
+            if ratio > 1 + threshold:
+                regressions.append((result, metric, ratio))
+    return regressions
+
+
+def print_result(result, file = sys.stdout):
+    '''Subroutine for reporting one benchmark result.'''
+
+    memory = f"{result['bytes_per_cell']:9.1f} B/cell" if result['peak_bytes'] is not None else ''
+    print(f"{result['name']:24} {result['x_cells']:5} * {result['y_cells']:<5} "
+          f"{1e3 * result['seconds_min']:10.2f} ms {result['mazes_per_ms']:9.3f} mazes/ms "
+          f"{result['us_per_cell']:8.2f} us/cell {memory}", file = file)
@@ -0,0 +1,88 @@
+# On-disk cache of generated mazes, keyed by algorithm, size and seed
+# 2026-10-18
+
+import os
+import hashlib
+import tempfile
+from Maze.structs import GridMaze
+from Maze.mazefile import write_maze, load_maze
+
+
+GENERATOR_VERSION = 2    # bump when a generator gives another maze for the same seed
+
+
+class MazeCache:
+    '''Content-addressed store of compact mazes and their solutions.
+    Each entry is a maze file (see Maze.mazefile) named by the hash of
+    (algorithm, width, height, seed, GENERATOR_VERSION) holding the
+    passage bits and, optionally, the solution path. Reading an entry
+    marks it as recently used; once the cache exceeds max_bytes the
+    least recently used ones are removed. The size is tracked from the
+    entries this process writes and rescanned only when it goes over
+    max_bytes, so entries of other processes are seen at the next scan.
+    >> cache = MazeCache('./.maze_cache')
+    >> cache.put('prim', 28, 16, 7, cells, path)
+    >> cache.get('prim', 28, 16, 7)
+    (b'...', array('q', [...]))
+    '''
+
+    def __init__(self, directory = './.maze_cache', max_bytes = 256 * 2 ** 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.size = None    # estimated bytes in the cache, None until scanned
+        os.makedirs(directory, exist_ok = True)
+
+    def path_of(self, algorithm, width, height, seed):
+        key = f'{algorithm}:{width}:{height}:{seed}:{GENERATOR_VERSION}'
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + '.maze')
+
+    def get(self, algorithm, width, height, seed):
+        # (cells, path) of a cached maze, path is None when not stored; None on a miss
+        file_path = self.path_of(algorithm, width, height, seed)
+        try:
+            header, maze, path = load_maze(file_path)
+            os.utime(file_path)    # most recently used
+        except FileNotFoundError:
+            return None
+
+        assert (header.width, header.height) == (width, height), f'Corrupted cache entry {file_path}'
+        return bytes(maze.cells), path
+
+    def put(self, algorithm, width, height, seed, cells, path = None):
+        # store a maze, written to a temporary file first so readers never see half an entry
+        maze = GridMaze(width, height, cells = bytearray(cells))
+
+        descriptor, temporary = tempfile.mkstemp(dir = self.directory, suffix = '.tmp')
+        os.close(descriptor)
+        write_maze(temporary, maze, algorithm, seed, path)
+        file_path = self.path_of(algorithm, width, height, seed)
+        os.replace(temporary, file_path)
+
+        if self.size is None:
+            self.evict()
+        else:
+            self.size += os.path.getsize(file_path)
+            if self.size > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        # remove least recently used entries until the cache fits in max_bytes
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.maze'):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:    # removed by another process
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:    # removed by another process
+                pass
+            total -= size
+        self.size = total
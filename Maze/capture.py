@@ -0,0 +1,309 @@
+# Subroutines for capturing frames in background threads
+# 2026-10-18
+
+import time
+import struct
+import zlib
+import threading
+from queue import Queue
+import pygame
+import Maze.instrument as instrument
+
+
+# pixel layout copied from the surface for each format
+PIXEL_FORMAT = {'png': 'RGB', 'bmp': 'BGRA', 'tga': 'BGRA', 'gif': 'RGB'}
+
+
+# ----- Image encoders -----
+
+def png_chunk(kind, data):
+    '''Length, type, data and crc of a PNG chunk.'''
+
+    crc = zlib.crc32(kind + data) & 0xffffffff
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', crc)
+
+
+def encode_png(pixels, size, compression = 6):
+    '''Encode RGB pixels as a PNG with a given zlib compression level.'''
+
+    width, height = size
+    stride = 3 * width
+    rows = b''.join(b'\x00' + pixels[y * stride:(y + 1) * stride] for y in range(height))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)   # 8 bit RGB
+    return (b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', header)
+            + png_chunk(b'IDAT', zlib.compress(rows, compression)) + png_chunk(b'IEND', b''))
+
+
+def encode_bmp(pixels, size, compression = None):
+    '''Encode BGRA pixels as an uncompressed, top-down BMP.'''
+
+    width, height = size
+    file_header = struct.pack('<2sIHHI', b'BM', 14 + 40 + len(pixels), 0, 0, 14 + 40)
+    info_header = struct.pack('<IiiHHIIiiII', 40, width, -height, 1, 32, 0, len(pixels), 2835, 2835, 0, 0)
+    return file_header + info_header + pixels
+
+
+def encode_tga(pixels, size, compression = None):
+    '''Encode BGRA pixels as an uncompressed, top-down TGA.'''
+
+    width, height = size
+    header = struct.pack('<BBBHHBHHHHBB', 0, 0, 2, 0, 0, 0, 0, 0, width, height, 32, 0x28)
+    return header + pixels
+
+
+ENCODERS = {'png': encode_png, 'bmp': encode_bmp, 'tga': encode_tga}
+
+
+# ----- Background writer -----
+
+class FrameWriter:
+    '''Saves frames without blocking the render loop. The pixels of a
+    surface are copied on save and encoded by worker threads; when
+    queue_size frames are pending, save waits for a free slot.
+    >> writer = FrameWriter('tga')
+    >> writer.save(screen, './capture/maze_0001')    # writes maze_0001.tga
+    >> writer.close()
+    '''
+
+    def __init__(self, image_format = 'png', compression = 1, workers = 2, queue_size = 32):
+        assert image_format in PIXEL_FORMAT, f'Unknown image format {image_format}'
+
+        self.image_format = image_format
+        self.compression = compression
+        self.queue = Queue(maxsize = queue_size)
+        self.errors = []
+        self.closed = False
+
+        self.workers = [threading.Thread(target = self.work, daemon = True) for _ in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def save(self, surface, path, delay = None):
+        # copy the surface and queue it, path is given without extension; delay is for animations
+        pixels = pygame.image.tobytes(surface, PIXEL_FORMAT[self.image_format])
+        if instrument.ENABLED:
+            instrument.count('bytes copied', len(pixels))
+        self.queue.put((pixels, surface.get_size(), f'{path}.{self.image_format}'))
+
+    def work(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                self.queue.task_done()
+                return
+            started = time.perf_counter() if instrument.ENABLED else None
+            try:
+                self.write(*job)
+            except Exception as error:    # keep the worker alive, save would block without it
+                self.errors.append(error)
+            finally:
+                if started is not None:
+                    instrument.add_time('encode', time.perf_counter() - started)
+                self.queue.task_done()
+
+    def write(self, pixels, size, path):
+        # encode a frame, called from the worker threads
+        data = ENCODERS[self.image_format](pixels, size, self.compression)
+        with open(path, 'wb') as image:
+            image.write(data)
+        if instrument.ENABLED:
+            instrument.count('bytes written', len(data))
+
+    def close(self):
+        # wait for every pending frame to be written, once
+        if self.closed:
+            return
+        self.closed = True
+        for _ in self.workers:
+            self.queue.put(None)
+        for worker in self.workers:
+            worker.join()
+        for error in self.errors:
+            print(f'Could not save frame: {error}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ----- Animated GIF -----
+
+def lzw_encode(indices, min_size = 8):
+    '''Compress palette indices with the variable-length LZW of GIF.'''
+
+    clear, end = 1 << min_size, (1 << min_size) + 1
+    out = bytearray()
+    bits, n_bits = 0, 0
+    size, next_code, table = min_size + 1, end + 1, {}
+
+    def emit(code):
+        nonlocal bits, n_bits
+        bits |= code << n_bits
+        n_bits += size
+        while n_bits >= 8:
+            out.append(bits & 0xff)
+            bits >>= 8
+            n_bits -= 8
+
+    emit(clear)
+    prefix = indices[0]
+    for index in indices[1:]:
+        key = (prefix << 8) | index
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix)
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+            if next_code > (1 << size) and size < 12:
+                size += 1
+        else:
+            emit(clear)
+            size, next_code, table = min_size + 1, end + 1, {}
+        prefix = index
+    emit(prefix)
+    emit(end)
+
+    if n_bits:
+        out.append(bits & 0xff)
+    return bytes(out)
+
+
+def sub_blocks(data):
+    '''Split data in the length-prefixed blocks of GIF.'''
+
+    blocks = bytearray()
+    for i in range(0, len(data), 255):
+        chunk = data[i:i + 255]
+        blocks.append(len(chunk))
+        blocks += chunk
+    blocks.append(0)
+    return bytes(blocks)
+
+
+def first_difference(row_1, row_2):
+    '''Index of the first different byte of two equal rows, by
+    bisecting over prefix comparisons.'''
+
+    low, high = 0, len(row_1)
+    while low < high:
+        middle = (low + high) // 2
+        if row_1[:middle + 1] == row_2[:middle + 1]:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+class GifWriter(FrameWriter):
+    '''Streams every saved frame into a single animated GIF. Colors are
+    mapped to a fixed palette and only the regions that changed since the
+    previous frame are encoded, so only the previous frame is kept in
+    memory. Frames are written in order by one worker thread.
+    >> writer = GifWriter('./capture/maze.gif', [(0, 0, 0), (206, 0, 178)])
+    >> writer.save(screen)
+    >> writer.close()
+    '''
+
+    BAND_GAP = 8    # unchanged rows that split a frame in separate regions
+
+    def __init__(self, path, palette, delay = 3, queue_size = 32):
+        assert 0 < len(palette) <= 256, 'A GIF palette holds up to 256 colors'
+
+        self.path = path
+        self.delay = delay    # centiseconds between frames saved without a delay
+        self.palette = [tuple(color) for color in palette]
+        self.indices = {bytes(color): i for i, color in enumerate(self.palette)}
+        self.stream = None
+        self.previous = None
+        super().__init__('gif', None, 1, queue_size)
+
+    def save(self, surface, path = None, delay = None):
+        # every frame goes to the same file, path is ignored; delay in centiseconds
+        pixels = pygame.image.tobytes(surface, 'RGB')
+        if instrument.ENABLED:
+            instrument.count('bytes copied', len(pixels))
+        self.queue.put((pixels, surface.get_size(), self.path, self.delay if delay is None else delay))
+
+    def color_index(self, rgb):
+        # palette index of a color, unknown colors map to the nearest one
+        index = self.indices.get(rgb)
+        if index is None:
+            distance = lambda i: sum((a - b) ** 2 for a, b in zip(rgb, self.palette[i]))
+            index = self.indices[rgb] = min(range(len(self.palette)), key = distance)
+        return index
+
+    def changed_regions(self, pixels, size):
+        # (x, y, width, height) of the regions that differ from the previous frame
+        width, height = size
+        stride = 3 * width
+        if self.previous is None:
+            return [(0, 0, width, height)]
+
+        rows = [y for y in range(height)
+                if pixels[y * stride:(y + 1) * stride] != self.previous[y * stride:(y + 1) * stride]]
+
+        bands = []
+        for y in rows:
+            if bands and y - bands[-1][-1] <= self.BAND_GAP:
+                bands[-1].append(y)
+            else:
+                bands.append([y])
+
+        regions = []
+        for band in bands:
+            left, right = width, 0
+            for y in band:
+                row = pixels[y * stride:(y + 1) * stride]
+                old = self.previous[y * stride:(y + 1) * stride]
+                left = min(left, first_difference(row, old) // 3)
+                right = max(right, width - first_difference(row[::-1], old[::-1]) // 3)
+            regions.append((left, band[0], right - left, band[-1] - band[0] + 1))
+        return regions
+
+    def write(self, pixels, size, path, delay):
+        width, height = size
+        stride = 3 * width
+
+        if self.stream is None:
+            self.stream = open(path, 'wb')
+            self.write_header(width, height)
+
+        regions = self.changed_regions(pixels, size)
+        self.previous = pixels
+        if not regions:    # same image, only extend the previous frame
+            regions = [(0, 0, 1, 1)]
+
+        for i, (x, y, w, h) in enumerate(regions):
+            indices = bytearray()
+            for row in range(y, y + h):
+                start = row * stride + 3 * x
+                line = pixels[start:start + 3 * w]
+                indices += bytes(self.color_index(line[j:j + 3]) for j in range(0, 3 * w, 3))
+
+            shown = delay if i == len(regions) - 1 else 0
+            graphic_control = b'\x21\xf9\x04' + struct.pack('<BHBB', 0x04, shown, 0, 0)
+            descriptor = b'\x2c' + struct.pack('<HHHHB', x, y, w, h, 0)
+            block = graphic_control + descriptor + b'\x08' + sub_blocks(lzw_encode(bytes(indices)))
+            self.stream.write(block)
+            if instrument.ENABLED:
+                instrument.count('bytes written', len(block))
+
+    def write_header(self, width, height):
+        palette = self.palette + [(0, 0, 0)] * (256 - len(self.palette))
+        self.stream.write(b'GIF89a' + struct.pack('<HHBBB', width, height, 0xf7, 0, 0))
+        self.stream.write(b''.join(bytes(color) for color in palette))
+        self.stream.write(b'\x21\xff\x0bNETSCAPE2.0\x03\x01' + struct.pack('<H', 0) + b'\x00')   # loop forever
+
+    def close(self):
+        if self.closed:
+            return
+        super().close()
+        if self.stream:
+            self.stream.write(b'\x3b')
+            self.stream.close()
@@ -0,0 +1,146 @@
+# Distance fields: every shortest path from one cell, in one flood fill
+# 2026-10-18
+
+import weakref
+from array import array
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from Maze.structs import *
+
+
+FIELD_CACHE_SIZE = 16    # distance fields kept by distance_field
+
+
+@dataclass
+class DistanceField:
+    '''Distance and parent of every cell of a GridMaze, in steps from
+    a source cell. Cells the source cannot reach have distance -1 and
+    parent -1. Queries take Vectors, like astar.
+    >> field = flood_fill(maze, maze.vector(0))
+    >> field.distance_to(maze.vector(5))
+    5
+    '''
+    grid: GridMaze
+    source: int      # cell index the distances are measured from
+    distance: array = field(repr=False)    # int32 per cell, row-major
+    parent: array = field(repr=False)      # int64 cell index per cell, row-major
+
+    def reachable(self, vect):
+        # check if the source connects to a vect
+        index = self.grid.cell(vect)
+        return index is not None and self.distance[index] >= 0
+
+    def distance_to(self, vect):
+        # steps from the source to a vect, None if unreachable
+        index = self.grid.cell(vect)
+        if index is None or self.distance[index] < 0:
+            return None
+        return self.distance[index]
+
+    def trace(self, index):
+        # cell indices from the source to index, None if unreachable
+        if self.distance[index] < 0:
+            return None
+        cells = [0] * (self.distance[index] + 1)
+        for i in range(len(cells) - 1, -1, -1):
+            cells[i] = index
+            index = self.parent[index]
+        return cells
+
+    def path(self, vect):
+        # Vectors from the source to a vect, None if unreachable
+        index = self.grid.cell(vect)
+        cells = self.trace(index) if index is not None else None
+        if cells is None:
+            return None
+        return deque(self.grid.vector(i) for i in cells)
+
+    def farthest(self):
+        # cell index at the largest distance from the source
+        return max(range(len(self.distance)), key = self.distance.__getitem__)
+
+    def to_array(self):
+        '''Distances of every cell, row-major, -1 where unreachable.
+        Shares memory with the field.'''
+        return self.distance
+
+
+def flood_fill(maze, source):
+    '''Breadth first search over the passage bits of a GridMaze from
+    the cell at the Vector source. Visits every reachable cell once.'''
+
+    grid = maze if isinstance(maze, GridMaze) else GridMaze.from_maze(maze)
+    cells, width = grid.cells, grid.width
+    start = grid.cell(source)
+    assert start is not None, f'{source} is outside the maze'
+
+    size = grid.width * grid.height
+    distance = array('i', [-1]) * size
+    parent = array('q', [-1]) * size
+    steps = ((NORTH, -width), (SOUTH, width), (EAST, 1), (WEST, -1))
+
+    distance[start] = 0
+    queue = array('q', [start])    # every reached cell in order, read with a cursor
+    head = 0
+    while head < len(queue):
+        index = queue[head]
+        head += 1
+        bits = cells[index]
+        next_distance = distance[index] + 1
+        for direction, step in steps:
+            if bits & direction:
+                other = index + step
+                if distance[other] < 0:
+                    distance[other] = next_distance
+                    parent[other] = index
+                    queue.append(other)
+
+    return DistanceField(grid, start, distance, parent)
+
+
+# ----- Cache of fields -----
+
+fields = OrderedDict()    # (id of a maze, source cell) -> DistanceField, least recently used first
+grids = {}                # id of a Maze of Nodes -> its GridMaze
+
+
+def forget(maze):
+    '''Drop the cached fields of a maze, needed after changing it.'''
+
+    drop(id(maze))
+
+
+def drop(key):
+    grids.pop(key, None)
+    for cached in [k for k in fields if k[0] == key]:
+        del fields[cached]
+
+
+def compact(maze):
+    # GridMaze of a maze, converted once for Mazes of Nodes
+    if isinstance(maze, GridMaze):
+        return maze
+    key = id(maze)
+    if key not in grids:
+        grids[key] = GridMaze.from_maze(maze)
+        weakref.finalize(maze, drop, key)    # ids are reused once the maze is gone
+    return grids[key]
+
+
+def distance_field(maze, source):
+    '''DistanceField of a maze from the Vector source, computed on the
+    first request and cached for the next ones. Mazes of Nodes are
+    converted to a GridMaze once. Call forget after changing a maze.'''
+
+    grid = compact(maze)
+    key = (id(maze), grid.cell(source))
+
+    cached = fields.get(key)
+    if cached is not None:
+        fields.move_to_end(key)
+        return cached
+
+    result = fields[key] = flood_fill(grid, source)
+    if len(fields) > FIELD_CACHE_SIZE:
+        fields.popitem(last = False)
+    return result
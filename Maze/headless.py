@@ -0,0 +1,225 @@
+# Subroutines for generating and solving mazes without rendering
+# 2026-10-18
+
+import Maze.algorithms as algorithms
+from Maze.structs import *
+from Maze.mazefile import write_maze
+from Maze.distance import flood_fill
+import sys, os
+import time
+import json
+import base64
+import random
+import hashlib
+from array import array
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def new_grid(x_cells, y_cells):
+    '''Blank GridMaze laid out with the same cell size as the canvas.'''
+
+    origin = Vector(algorithms.CELLSIZE // 2, algorithms.CELLSIZE // 2)
+    return GridMaze(x_cells, y_cells, origin, algorithms.CELLSIZE)
+
+
+def generate(x_cells, y_cells, algorithm, seed = None):
+    '''Generate a GridMaze with one of the algorithms of ALG_GEN. The
+    same seed always gives the same maze.'''
+
+    if seed is not None:
+        random.seed(seed)
+
+    maze = new_grid(x_cells, y_cells)
+    generator = getattr(algorithms, algorithms.ALG_GEN[algorithm])
+
+    for _ in generator(maze):
+        pass
+    return maze
+
+
+def solve(maze):
+    '''Solve a maze from its top left to its bottom right cell.
+    Returns the path as a list of cell indices.'''
+
+    return flood_fill(maze, maze.vector(0)).trace(len(maze.cells) - 1)
+
+
+# ----- Parallel farm -----
+
+@dataclass
+class FarmResult:
+    '''Compact result of a generate and solve task.'''
+
+    index: int
+    seed: int
+    width: int
+    height: int
+    cells: bytes     # passage bits of every cell, as GridMaze.passage_bits
+    path: array      # cell indices from the top left to the bottom right cell
+    generation_time: float
+    solve_time: float
+    cached: bool = False    # read from a MazeCache
+
+    def to_grid(self):
+        return GridMaze(self.width, self.height, cells = bytearray(self.cells))
+
+
+def generator_name(algorithm):
+    '''Name of the generator of an algorithm, with the settings its
+    mazes depend on, e.g. growing:mixed. Keys the MazeCache.'''
+
+    name = algorithms.ALG_GEN[algorithm]
+    if name == 'growing':
+        name += ':' + algorithms.GROWING_POLICY
+    return name
+
+
+def task_seed(seed, index):
+    '''Seed of the task index of a batch, independent of the worker
+    that runs it.'''
+
+    digest = hashlib.sha256(f'{seed}:{index}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+
+def run_task(task):
+    '''Generate and solve one maze, task is (index, seed, x_cells,
+    y_cells, algorithm, cache). Mazes found in the MazeCache cache are
+    read instead of generated. Runs in the worker processes of farm.'''
+
+    index, seed, x_cells, y_cells, algorithm, cache = task
+    name = generator_name(algorithm)
+
+    t_0 = time.perf_counter()
+    entry = cache.get(name, x_cells, y_cells, seed) if cache else None
+    if entry and entry[1] is not None:
+        cells, path = entry
+        return FarmResult(index, seed, x_cells, y_cells, cells, path,
+                          time.perf_counter() - t_0, 0.0, True)
+
+    maze = generate(x_cells, y_cells, algorithm, seed)
+    t_1 = time.perf_counter()
+    path = array('q', solve(maze))
+    t_2 = time.perf_counter()
+
+    cells = maze.passage_bits()
+    if cache:
+        cache.put(name, x_cells, y_cells, seed, cells, path)
+
+    return FarmResult(index, seed, maze.width, maze.height, cells, path, t_1 - t_0, t_2 - t_1)
+
+
+def farm(count, x_cells, y_cells, algorithm, seed = 0, workers = None, ordered = True, cache = None):
+    '''Generator of the FarmResult of count mazes, spread over a pool
+    of workers processes (all cores by default, 1 runs in this process).
+    Results come in task order, or as they complete when ordered is
+    False; either way each maze only depends on seed and its index.
+    Mazes are shared between runs and workers through a MazeCache.'''
+
+    tasks = [(i, task_seed(seed, i), x_cells, y_cells, algorithm, cache) for i in range(count)]
+
+    if workers == 1:
+        yield from map(run_task, tasks)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        if ordered:
+            chunksize = max(1, count // (4 * (workers or os.cpu_count() or 1)))
+            yield from pool.map(run_task, tasks, chunksize = chunksize)
+        else:
+            for future in as_completed([pool.submit(run_task, task) for task in tasks]):
+                yield future.result()
+
+
+# ----- Batch runs -----
+
+def to_record(result, algorithm):
+    '''Machine-readable description of a solved maze. Cells hold the
+    passage bits (NORTH, SOUTH, EAST, WEST) encoded in base64.'''
+
+    return {
+        'index': result.index,
+        'seed': result.seed,
+        'algorithm': algorithms.ALG_GEN[algorithm],
+        'width': result.width,
+        'height': result.height,
+        'cells': base64.b64encode(result.cells).decode('ascii'),
+        'path': result.path.tolist(),
+    }
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_headless(count, x_cells, y_cells, algorithm, output = None, image_dir = None, image_cell = 4,
+                 seed = None, workers = 1, cache = None, maze_dir = None):
+    '''Subroutine for generating and solving count mazes without a
+    display, on workers processes. Solved mazes are written to output
+    as JSON lines, to maze_dir as maze files and, with image_dir,
+    rendered as PNGs of image_cell pixels per cell. Mazes already in the MazeCache cache are read
+    from disk. Returns a summary of the run.'''
+
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    gen_times, solve_times = [], []
+    cached = 0
+    stream = open(output, 'w') if output else None
+
+    if image_dir:
+        from Maze.raster import save_image    # needs NumPy
+        os.makedirs(image_dir, exist_ok = True)
+    if maze_dir:
+        os.makedirs(maze_dir, exist_ok = True)
+
+    start = time.perf_counter()
+    try:
+        for result in farm(count, x_cells, y_cells, algorithm, seed, workers, cache = cache):
+            cached += result.cached
+            gen_times.append(result.generation_time)
+            solve_times.append(result.solve_time)
+
+            if stream:
+                stream.write(json.dumps(to_record(result, algorithm)) + '\n')
+            if image_dir:
+                path = os.path.join(image_dir, 'maze_%04d.png' % result.index)
+                save_image(result.to_grid(), path, image_cell)
+            if maze_dir:
+                path = os.path.join(maze_dir, 'maze_%04d.maze' % result.index)
+                write_maze(path, result.to_grid(), algorithms.ALG_GEN[algorithm], result.seed, result.path)
+    finally:
+        if stream:
+            stream.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'mazes': count,
+        'size': [x_cells, y_cells],
+        'algorithm': algorithms.ALG_GEN[algorithm],
+        'seed': seed,
+        'workers': workers or os.cpu_count(),
+        'cached': cached,
+        'mazes_per_second': count / elapsed if elapsed else 0.0,
+        'generation_mean_ms': 1e3 * sum(gen_times) / count,
+        'solve_mean_ms': 1e3 * sum(solve_times) / count,
+        'solve_p50_ms': 1e3 * percentile(solve_times, 0.5),
+        'solve_p95_ms': 1e3 * percentile(solve_times, 0.95),
+        'solve_max_ms': 1e3 * max(solve_times),
+    }
+
+
+def print_summary(summary, file = sys.stdout):
+    '''Subroutine for reporting a headless run.'''
+
+    print(f"{summary['mazes']} mazes of {summary['size'][0]} * {summary['size'][1]} "
+          f"cells with {summary['algorithm']} (seed {summary['seed']}, {summary['workers']} workers)", file = file)
+    if summary['cached']:
+        print(f"  {summary['cached']} mazes read from the cache", file = file)
+    print(f"  {summary['mazes_per_second']:.2f} mazes/s, "
+          f"generation {summary['generation_mean_ms']:.2f} ms/maze", file = file)
+    print(f"  solve latency: mean {summary['solve_mean_ms']:.2f} ms, "
+          f"p50 {summary['solve_p50_ms']:.2f} ms, p95 {summary['solve_p95_ms']:.2f} ms, "
+          f"max {summary['solve_max_ms']:.2f} ms", file = file)
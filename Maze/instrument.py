@@ -0,0 +1,215 @@
+# Phase timers and counters showing where a run spends its time
+# 2026-10-18
+
+import sys
+import json
+import time
+import cProfile
+import pstats
+import threading
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from functools import wraps
+
+
+ENABLED = False    # checked by per-frame code before counting, hot paths are patched by enable
+
+TIMES = defaultdict(float)    # phase -> seconds spent in it, nested phases excluded
+COUNTERS = Counter()          # event -> occurrences or bytes
+BACKGROUND = set()            # timers of work done in other threads, overlapping the phases
+
+stack = []          # phases being timed, innermost last
+mark = [0.0]        # time the innermost phase was last resumed
+lock = threading.Lock()    # workers count from their own threads
+patched = []        # (owner, attribute, original) replaced by enable
+profiler = None
+
+
+# ----- Timers and counters -----
+
+def count(name, amount = 1):
+    '''Add amount to a counter.'''
+
+    with lock:
+        COUNTERS[name] += amount
+
+
+def add_time(name, seconds):
+    '''Add seconds to a timer, for work done outside the main thread.'''
+
+    with lock:
+        TIMES[name] += seconds
+        BACKGROUND.add(name)
+
+
+def enter(name):
+    # pause the current phase and start timing name
+    now = time.perf_counter()
+    if stack:
+        TIMES[stack[-1]] += now - mark[0]
+    stack.append(name)
+    mark[0] = now
+
+
+def leave():
+    # stop timing the current phase and resume the one it interrupted
+    now = time.perf_counter()
+    TIMES[stack.pop()] += now - mark[0]
+    mark[0] = now
+
+
+class Phase:
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        enter(self.name)
+
+    def __exit__(self, *exc):
+        leave()
+
+
+NO_PHASE = nullcontext()
+
+def phase(name):
+    '''Context manager timing its block as the phase name, a no-op
+    while instrumentation is disabled.'''
+
+    return Phase(name) if ENABLED else NO_PHASE
+
+
+def timed(iterable, name):
+    '''Iterate while timing the production of every item as the phase
+    name, e.g. the steps of a generator. Returns iterable unchanged
+    while instrumentation is disabled.'''
+
+    if not ENABLED:
+        return iterable
+
+    def items():
+        iterator = iter(iterable)
+        while True:
+            enter(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                leave()
+            yield item
+    return items()
+
+
+def wrapped(function, counter = None, phase_name = None):
+    # function counting its calls in counter and timing them as phase_name
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if counter:
+            COUNTERS[counter] += 1
+        if phase_name is None:
+            return function(*args, **kwargs)
+        enter(phase_name)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            leave()
+    return wrapper
+
+
+def patch(owner, attribute, counter = None, phase_name = None):
+    original = getattr(owner, attribute)
+    patched.append((owner, attribute, original))
+    setattr(owner, attribute, wrapped(original, counter, phase_name))
+
+
+def enable():
+    '''Reset the timers and counters and start instrumenting. Hot
+    paths are wrapped here, so they cost nothing while disabled.'''
+
+    global ENABLED
+    import Maze.algorithms as algorithms
+    from Maze.structs import Maze, GridMaze
+
+    disable()
+    TIMES.clear()
+    COUNTERS.clear()
+    BACKGROUND.clear()
+    stack.clear()
+    mark[0] = time.perf_counter()
+
+    patch(Maze, 'get_node', 'node lookups')
+    patch(Maze, 'has_node', 'node lookups')
+    patch(GridMaze, 'cell', 'node lookups')
+    for name in ('draw_corridor', 'draw_head', 'show_message', 'show_coloring_message'):
+        patch(algorithms, name, 'draw calls')
+    patch(algorithms, 'get_font', None, 'fonts')
+    patch(algorithms, 'save_frame', 'frames', 'capture')
+    ENABLED = True
+
+
+def disable():
+    '''Stop instrumenting and restore the wrapped functions.'''
+
+    global ENABLED
+    ENABLED = False
+    while patched:
+        owner, attribute, original = patched.pop()
+        setattr(owner, attribute, original)
+
+
+# ----- Reports -----
+
+def report():
+    '''Timers and counters as a JSON-ready dict.'''
+
+    with lock:
+        return {'phases': dict(TIMES), 'background': sorted(BACKGROUND), 'counters': dict(COUNTERS)}
+
+
+def print_summary(file = sys.stdout):
+    '''Subroutine for reporting the timers and counters of a run.'''
+
+    summary = report()
+    phases = {name: seconds for name, seconds in summary['phases'].items() if name not in BACKGROUND}
+    total = sum(phases.values())
+    print('Phases:', file = file)
+    for name, seconds in sorted(phases.items(), key = lambda item: -item[1]):
+        share = 100 * seconds / total if total else 0
+        print(f'  {name:24} {seconds:10.3f} s {share:6.1f} %', file = file)
+    for name in sorted(BACKGROUND):
+        print(f'  {name:24} {summary["phases"][name]:10.3f} s  (in background threads)', file = file)
+    print('Counters:', file = file)
+    for name, value in sorted(summary['counters'].items()):
+        print(f'  {name:24} {value:12}', file = file)
+
+
+def export(path):
+    '''Write the timers and counters to a JSON file.'''
+
+    with open(path, 'w') as output:
+        json.dump(report(), output, indent = 2)
+
+
+def start_profile():
+    '''Start profiling with cProfile.'''
+
+    global profiler
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+
+def stop_profile(path = None, top = 15, file = sys.stdout):
+    '''Stop profiling, write the stats to path for pstats or snakeviz
+    and print the top functions by cumulative time. Returns the
+    pstats.Stats of the run.'''
+
+    global profiler
+    profiler.disable()
+    if path:
+        profiler.dump_stats(path)
+
+    stats = pstats.Stats(profiler, stream = file)
+    stats.sort_stats('cumulative').print_stats(top)
+    profiler = None
+    return stats
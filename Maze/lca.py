@@ -0,0 +1,113 @@
+# Path queries between any two cells of a perfect maze, without searching
+# 2026-10-18
+
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from Maze.structs import *
+from Maze.distance import flood_fill
+
+
+BIT_COUNT = bytes(bin(bits & (NORTH | SOUTH | EAST | WEST)).count('1') for bits in range(256))   # translation table
+
+
+@dataclass
+class PathIndex:
+    '''Binary lifting table of a perfect maze rooted at one cell. In a
+    perfect maze the only path between two cells goes through their
+    lowest common ancestor, found by jumping up the tree in powers of
+    two, so distance queries take O(log n) and path queries O(log n)
+    plus the length of the path.
+    >> index = build_index(maze)
+    >> index.distance(maze.vector(0), maze.vector(5))
+    5
+    '''
+    grid: GridMaze
+    depth: array = field(repr=False)    # int32 steps from the root per cell
+    up: list = field(repr=False)        # up[k][cell] is the 2 ** k-th ancestor of cell, int32 arrays
+
+    def ancestor(self, index, steps):
+        # cell steps levels above index
+        k = 0
+        while steps:
+            if steps & 1:
+                index = self.up[k][index]
+            steps >>= 1
+            k += 1
+        return index
+
+    def lca(self, index_1, index_2):
+        # lowest common ancestor of two cell indices
+        depth = self.depth
+        if depth[index_1] < depth[index_2]:
+            index_1, index_2 = index_2, index_1
+        index_1 = self.ancestor(index_1, depth[index_1] - depth[index_2])
+        if index_1 == index_2:
+            return index_1
+
+        for level in reversed(self.up):
+            if level[index_1] != level[index_2]:
+                index_1, index_2 = level[index_1], level[index_2]
+        return self.up[0][index_1]
+
+    def cell_distance(self, index_1, index_2):
+        # steps between two cell indices
+        return self.depth[index_1] + self.depth[index_2] - 2 * self.depth[self.lca(index_1, index_2)]
+
+    def trace(self, index_1, index_2):
+        # cell indices of the path from index_1 to index_2
+        common = self.lca(index_1, index_2)
+        parent = self.up[0]
+
+        rising = []
+        while index_1 != common:
+            rising.append(index_1)
+            index_1 = parent[index_1]
+        falling = []
+        while index_2 != common:
+            falling.append(index_2)
+            index_2 = parent[index_2]
+
+        rising.append(common)
+        rising.extend(reversed(falling))
+        return rising
+
+    def distance(self, vect_1, vect_2):
+        # steps between two Vectors
+        return self.cell_distance(self.locate(vect_1), self.locate(vect_2))
+
+    def path(self, vect_1, vect_2):
+        # Vectors of the path between two Vectors, like astar
+        return deque(self.grid.vector(i) for i in self.trace(self.locate(vect_1), self.locate(vect_2)))
+
+    def locate(self, vect):
+        index = self.grid.cell(vect)
+        assert index is not None, f'{vect} is outside the maze'
+        return index
+
+
+def build_index(maze, root = None):
+    '''Build the PathIndex of a perfect maze, such as the ones dfs and
+    prim generate, rooted at the Vector root (the top left cell by
+    default). Raises ValueError if the maze has loops or cells that
+    cannot be reached, as paths would not be unique.'''
+
+    grid = maze if isinstance(maze, GridMaze) else GridMaze.from_maze(maze)
+    size = grid.width * grid.height
+
+    passages = sum(bytes(grid.cells).translate(BIT_COUNT)) // 2
+    if passages != size - 1:
+        raise ValueError(f'Not a perfect maze: {passages} passages between {size} cells')
+
+    tree = flood_fill(grid, root if root is not None else grid.vector(0))
+    if min(tree.distance) < 0:
+        raise ValueError('Not a perfect maze: some cells cannot be reached')
+
+    parent = array('i', tree.parent)
+    parent[tree.source] = tree.source    # the root is its own ancestor
+    up = [parent]
+    for _ in range(max(tree.distance).bit_length() - 1):
+        previous = up[-1]
+        up.append(array('i', [previous[previous[i]] for i in range(size)]))
+
+    return PathIndex(grid, tree.distance, up)
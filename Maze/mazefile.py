@@ -0,0 +1,125 @@
+# Binary file format for compact mazes, with memory-mapped loading
+# 2026-10-18
+
+import mmap
+import struct
+from array import array
+from dataclasses import dataclass
+from Maze.structs import *
+
+
+MAGIC = b'MAZE'
+VERSION = 1
+
+# magic, version, flags, width, height, seed, algorithm, solution length
+HEADER = struct.Struct('<4sHHIIQ16sQ')
+HEADER_SIZE = 64    # the body starts on a 64 bytes boundary
+
+HAS_SEED = 1    # header flags
+
+
+@dataclass
+class MazeHeader:
+    '''Metadata stored at the start of a maze file.
+
+    The layout of a file is:
+      - HEADER padded to HEADER_SIZE bytes
+      - the body, one byte of passage bits per cell, row-major
+      - padding to a multiple of 8 bytes, then the solution path as
+        int64 cell indices, when solution_length is not zero
+    '''
+    width: int
+    height: int
+    algorithm: str = ''
+    seed: int = None
+    solution_length: int = 0
+    version: int = VERSION
+
+    @property
+    def body_size(self):
+        return self.width * self.height
+
+    @property
+    def solution_offset(self):
+        end = HEADER_SIZE + self.body_size
+        return end + (-end % 8)
+
+    def pack(self):
+        flags = HAS_SEED if self.seed is not None else 0
+        header = HEADER.pack(MAGIC, self.version, flags, self.width, self.height, self.seed or 0,
+                             self.algorithm.encode('ascii')[:16], self.solution_length)
+        return header.ljust(HEADER_SIZE, b'\x00')
+
+    @classmethod
+    def unpack(cls, data):
+        magic, version, flags, width, height, seed, algorithm, length = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('Not a maze file')
+        if version > VERSION:
+            raise ValueError(f'Maze file version {version} is newer than {VERSION}')
+        seed = seed if flags & HAS_SEED else None
+        return cls(width, height, algorithm.rstrip(b'\x00').decode('ascii'), seed, length, version)
+
+
+def write_maze(path, maze, algorithm = '', seed = None, solution = None):
+    '''Write a GridMaze, with its solution path as cell indices if given.'''
+
+    solution = array('q', solution or [])
+    header = MazeHeader(maze.width, maze.height, algorithm, seed, len(solution))
+
+    with open(path, 'wb') as output:
+        output.write(header.pack())
+        output.write(maze.passage_bits())
+        output.write(b'\x00' * (header.solution_offset - HEADER_SIZE - header.body_size))
+        output.write(solution.tobytes())
+    return header
+
+
+def read_header(path):
+    '''MazeHeader of a maze file.'''
+
+    with open(path, 'rb') as source:
+        return MazeHeader.unpack(source.read(HEADER_SIZE))
+
+
+def open_maze(path, writable = False):
+    '''Open a maze file without reading it. Returns (header, maze,
+    solution): maze is a GridMaze whose cells are a view of the mapped
+    file, so only the pages that are used get loaded; solution is a
+    view of the int64 path, or None. With writable, changes to the
+    maze are private to this process and never written to the file.'''
+
+    with open(path, 'rb') as source:
+        access = mmap.ACCESS_COPY if writable else mmap.ACCESS_READ
+        mapped = mmap.mmap(source.fileno(), 0, access = access)
+
+    view = memoryview(mapped)
+    header = MazeHeader.unpack(view[:HEADER_SIZE])
+
+    cells = view[HEADER_SIZE:HEADER_SIZE + header.body_size]
+    maze = GridMaze(header.width, header.height, cells = cells)
+
+    solution = None
+    if header.solution_length:
+        start = header.solution_offset
+        solution = view[start:start + 8 * header.solution_length].cast('q')
+    return header, maze, solution
+
+
+def load_maze(path):
+    '''Read a whole maze file into memory. Returns (header, maze,
+    solution) like open_maze, solution being an array or None.'''
+
+    with open(path, 'rb') as source:
+        data = source.read()
+
+    header = MazeHeader.unpack(data)
+    cells = bytearray(data[HEADER_SIZE:HEADER_SIZE + header.body_size])
+    maze = GridMaze(header.width, header.height, cells = cells)
+
+    solution = None
+    if header.solution_length:
+        solution = array('q')
+        start = header.solution_offset
+        solution.frombytes(data[start:start + 8 * header.solution_length])
+    return header, maze, solution
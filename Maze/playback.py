@@ -0,0 +1,56 @@
+# Scheduling of rendered frames within a time or frame budget
+# 2026-10-18
+
+import time
+
+
+SMOOTHING = 0.25    # weight of the last frame in the estimated frame time
+
+
+class Playback:
+    '''Iterator of the number of steps to play in each rendered frame,
+    so that steps steps fit in duration seconds and/or max_frames
+    frames. The time between two items is measured as the cost of a
+    frame and the batches grow or shrink to meet the deadline. Without
+    a budget every frame plays one step. The iteration never ends, the
+    caller stops once its steps are played.
+    >> for size in Playback(len(events), duration = 10):
+    >>     render(events[done:done + size])
+    '''
+
+    def __init__(self, steps, duration = None, max_frames = None, fps = 0):
+        self.steps = steps
+        self.duration = duration
+        self.max_frames = max_frames
+        self.frames = 0    # frames rendered
+        self.played = 0    # steps played
+        self.frame_time = 1 / fps if fps else 0.0    # estimated seconds per frame
+
+    def batch(self, time_left):
+        # steps of the next frame, spreading the rest over the frames left
+        remaining = max(1, self.steps - self.played)
+        frames_left = remaining
+
+        if self.max_frames:
+            frames_left = min(frames_left, max(1, self.max_frames - self.frames))
+        if time_left is not None and self.frame_time > 0:
+            frames_left = min(frames_left, max(1, int(time_left / self.frame_time)))
+
+        return -(-remaining // frames_left)
+
+    def __iter__(self):
+        last = time.perf_counter()
+        deadline = last + self.duration if self.duration else None
+
+        while True:
+            size = self.batch(deadline - last if deadline else None)
+            yield size
+
+            now = time.perf_counter()
+            if self.frames:
+                self.frame_time += SMOOTHING * (now - last - self.frame_time)
+            else:
+                self.frame_time = now - last
+            self.frames += 1
+            self.played += size
+            last = now
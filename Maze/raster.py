@@ -0,0 +1,93 @@
+# Subroutines for rendering whole mazes to pixels with NumPy
+# 2026-10-18
+
+import numpy as np
+import pygame
+from Maze.structs import *
+from Maze.algorithms import BG_MAZE, CORRIDOR_Color, HEAD_color, SIZESQ, CELLSIZE
+from Maze.capture import encode_png
+
+
+def cell_tiles(cellsize, fill = SIZESQ / CELLSIZE):
+    '''Pixel mask of a cell for each combination of its passage bits,
+    as an array of shape (16, cellsize, cellsize). Connected cells get
+    a centered square and an arm towards every open passage. Needs at
+    least 2 pixels per cell, with 1 every cell would be filled.'''
+
+    if cellsize < 2:
+        raise ValueError(f'Mazes need at least 2 pixels per cell, not {cellsize}')
+    size = max(1, round(fill * cellsize))
+    start = (cellsize - size) // 2
+    end = start + size
+    body = slice(start, end)
+
+    tiles = np.zeros((16, cellsize, cellsize), dtype = bool)
+    for bits in range(1, 16):
+        tiles[bits, body, body] = True
+        if bits & NORTH:
+            tiles[bits, :start, body] = True
+        if bits & SOUTH:
+            tiles[bits, end:, body] = True
+        if bits & WEST:
+            tiles[bits, body, :start] = True
+        if bits & EAST:
+            tiles[bits, body, end:] = True
+    return tiles
+
+
+def passage_bits(maze):
+    '''Passage bits of a maze as an array of shape (height, width).'''
+
+    if not isinstance(maze, GridMaze):
+        maze = GridMaze.from_maze(maze)
+    bits = np.frombuffer(maze.cells, dtype = np.uint8).reshape(maze.height, maze.width)
+    return bits & (NORTH | SOUTH | EAST | WEST)
+
+
+def rasterize(maze, cellsize = 4, background = BG_MAZE, corridor = CORRIDOR_Color):
+    '''Render a maze in one pass. Every cell becomes a cellsize * cellsize
+    block picked from cell_tiles by its passage bits. Returns an RGB
+    array of shape (height * cellsize, width * cellsize, 3).'''
+
+    bits = passage_bits(maze)
+    height, width = bits.shape
+
+    palette = np.array([background, corridor], dtype = np.uint8)
+    tiles = palette[cell_tiles(cellsize).view(np.uint8)]    # (16, cellsize, cellsize, 3)
+
+    image = tiles[bits]    # (height, width, cellsize, cellsize, 3)
+    return image.transpose(0, 2, 1, 3, 4).reshape(height * cellsize, width * cellsize, 3)
+
+
+def heatmap(field, cellsize = 4, near = HEAD_color, far = CORRIDOR_Color, background = BG_MAZE):
+    '''Render the corridors of a DistanceField shaded from near at its
+    source to far at the most distant cell. Unreachable cells keep the
+    background. Returns an RGB array like rasterize.'''
+
+    grid = field.grid
+    bits = passage_bits(grid)
+    height, width = bits.shape
+
+    distance = np.frombuffer(field.to_array(), dtype = np.int32).reshape(height, width)
+    shade = distance / max(1, distance.max())
+    colors = np.array(near) + shade[..., None] * (np.array(far) - np.array(near))    # (height, width, 3)
+    colors[distance < 0] = background
+
+    mask = cell_tiles(cellsize)[bits]    # (height, width, cellsize, cellsize)
+    image = np.where(mask[..., None], colors[:, :, None, None, :], np.array(background)).astype(np.uint8)
+    return image.transpose(0, 2, 1, 3, 4).reshape(height * cellsize, width * cellsize, 3)
+
+
+def to_surface(image):
+    '''pygame Surface of an RGB array returned by rasterize.'''
+
+    return pygame.surfarray.make_surface(image.swapaxes(0, 1))
+
+
+def save_image(maze, path, cellsize = 4, compression = 6):
+    '''Render a maze and write it as a PNG, without a display.'''
+
+    image = rasterize(maze, cellsize)
+    height, width, _ = image.shape
+    with open(path, 'wb') as output:
+        output.write(encode_png(image.tobytes(), (width, height), compression))
@@ -81,54 +81,71 @@ class Node:
 class Maze:
     '''Data Structure containing all nodes.'''
     nodes: list = field(default_factory=list)
+    index: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self):
+        # nodes are indexed by their (x, y) coordinates for O(1) lookups
+        for node in self.nodes:
+            self.index[self.key(node.current)] = node
+
+    @staticmethod
+    def key(vect):
+        # Vector is mutable (unhashable), so it is keyed by its coordinates
+        return (vect.x, vect.y)
 
     def insert_node(self, target):
         # add instances of Node to Maze
         if not isinstance(target, Node):
             print(f'Cannot add {target}, its not a Node')
-        elif target in self.nodes:
+        elif self.key(target.current) in self.index:
             print(f'{target} already in Maze nodes')
         else:
             self.nodes.append(target)
+            self.index[self.key(target.current)] = target
+
+    def get_node(self, vect):
+        # given a vect return the Node instance, None if not found
+        return self.index.get(self.key(vect))
 
     def is_visited(self, vect):
         # given a vect, check if a node is visited
-        for node in self.nodes:
-            if node.current == vect:
-                return node.visited
-        print('Node not found')
+        node = self.get_node(vect)
+        if node is None:
+            print('Node not found')
+            return None
+        return node.visited
 
     def set_visited(self, vect):
         # given a vect operates on a node to set as visited
-        found = False
-        for i, node in enumerate(self.nodes):
-            if node.current == vect:
-                self.nodes[i].visited = True
-                found = True
-        if found is False:
+        node = self.get_node(vect)
+        if node is None:
             print('Node not found')
+        else:
+            node.visited = True
 
     def has_node(self, vect):
-        # given a vect return the Node instance
-        vectors = [node.current for node in self.nodes]
-        return vect in vectors
+        # given a vect check if the Maze contains its Node
+        return self.key(vect) in self.index
 
     def set_connected(self, vect_1, vect_2):
         # given vect operate on node
-        assert self.has_node(vect_1) and self.has_node(vect_2), 'At least one not found'
+        node_1, node_2 = self.get_node(vect_1), self.get_node(vect_2)
+        assert node_1 is not None and node_2 is not None, 'At least one not found'
 
-        for i, node in enumerate(self.nodes):
-            if node.current == vect_1:
-                self.nodes[i].add_neighbor(vect_2)
-            elif node.current == vect_2:
-                self.nodes[i].add_neighbor(vect_1)
+        node_1.add_neighbor(vect_2)
+        node_2.add_neighbor(vect_1)
 
     def get_neighbors(self, target):
         # finds a nodes connected neighbors
-        for node in self.nodes:
-            if node.current == target:
-                return node.neighbors
-        print('Node not found')
+        node = self.get_node(target)
+        if node is None:
+            print('Node not found')
+            return None
+        return node.neighbors
+
+    def vectors(self):
+        # list the position of every node
+        return [node.current for node in self.nodes]
 
     def __str__(self):
         str_nodes = 'Maze:\n'
@@ -136,6 +153,176 @@ class Maze:
             str_nodes += str(node) + '\n'
         return str_nodes
 
+
+# passage bits of a GridMaze cell, plus a flag for visited cells
+NORTH, SOUTH, EAST, WEST = 1, 2, 4, 8
+VISITED = 16
+
+PASSAGES = bytes(bits & (NORTH | SOUTH | EAST | WEST) for bits in range(256))   # translation table
+
+DIRECTIONS = {NORTH: (0, -1), SOUTH: (0, 1), EAST: (1, 0), WEST: (-1, 0)}
+OPPOSITE = {NORTH: SOUTH, SOUTH: NORTH, EAST: WEST, WEST: EAST}
+
+
+@dataclass
+class GridMaze:
+    '''Compact Data Structure storing a maze as one byte per cell.
+    Cells are indexed row-major; each byte holds a passage bit for
+    every direction and a visited bit. Vectors are mapped to cells
+    through the position of the top left cell and the cell size, so
+    it can be used wherever a Maze is expected.
+    >> maze = GridMaze(2, 1)
+    >> maze.set_connected(Vector(0, 0), Vector(1, 0))
+    >> maze.get_neighbors(Vector(1, 0))
+    [Vector(x=0, y=0)]
+    '''
+    width: int
+    height: int
+    origin: Vector = field(default_factory=lambda: Vector(0, 0))   # center of the top left cell
+    cellsize: int = 1
+    cells: bytearray = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.cells is None:
+            self.cells = bytearray(self.width * self.height)
+
+    # ----- cell indices -----
+
+    def cell(self, vect):
+        # given a vect return its cell index, None if outside the grid
+        col, x_rest = divmod(vect.x - self.origin.x, self.cellsize)
+        row, y_rest = divmod(vect.y - self.origin.y, self.cellsize)
+        if x_rest or y_rest:
+            return None
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return int(row * self.width + col)
+        return None
+
+    def vector(self, index):
+        # given a cell index return the Vector at its center
+        row, col = divmod(index, self.width)
+        return Vector(self.origin.x + col * self.cellsize, self.origin.y + row * self.cellsize)
+
+    def neighbor(self, index, direction):
+        # cell index next to index in a direction, None at the borders
+        row, col = divmod(index, self.width)
+        d_x, d_y = DIRECTIONS[direction]
+        row, col = row + d_y, col + d_x
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return row * self.width + col
+        return None
+
+    def carve(self, index, direction):
+        # open the passage from index towards direction, on both cells
+        other = self.neighbor(index, direction)
+        assert other is not None, 'Cannot carve outside the grid'
+        self.cells[index] |= direction
+        self.cells[other] |= OPPOSITE[direction]
+        return other
+
+    def passages(self, index):
+        # cell indices connected to index
+        bits = self.cells[index]
+        return [self.neighbor(index, d) for d in DIRECTIONS if bits & d]
+
+    # ----- Maze interface -----
+
+    def insert_node(self, target):
+        # copy the state of a Node onto its cell
+        if not isinstance(target, Node):
+            print(f'Cannot add {target}, its not a Node')
+            return
+        assert self.has_node(target.current), f'{target} is outside the grid'
+        if target.visited:
+            self.set_visited(target.current)
+        for neighbor in target.neighbors:
+            self.set_connected(target.current, neighbor)
+
+    def is_visited(self, vect):
+        # given a vect, check if a cell is visited
+        index = self.cell(vect)
+        if index is None:
+            print('Node not found')
+            return None
+        return bool(self.cells[index] & VISITED)
+
+    def set_visited(self, vect):
+        # given a vect mark its cell as visited
+        index = self.cell(vect)
+        if index is None:
+            print('Node not found')
+        else:
+            self.cells[index] |= VISITED
+
+    def has_node(self, vect):
+        # given a vect check if it is a cell of the grid
+        return self.cell(vect) is not None
+
+    def set_connected(self, vect_1, vect_2):
+        # open the passage between two adjacent cells
+        index_1, index_2 = self.cell(vect_1), self.cell(vect_2)
+        assert index_1 is not None and index_2 is not None, 'At least one not found'
+
+        delta = ((vect_2.x - vect_1.x) // self.cellsize, (vect_2.y - vect_1.y) // self.cellsize)
+        for direction, d_xy in DIRECTIONS.items():
+            if d_xy == delta:
+                self.carve(index_1, direction)
+                return
+        raise AssertionError(f'{vect_1} and {vect_2} are not adjacent')
+
+    def get_neighbors(self, target):
+        # finds a cells connected neighbors
+        index = self.cell(target)
+        if index is None:
+            print('Node not found')
+            return None
+        return [self.vector(i) for i in self.passages(index)]
+
+    def passage_bits(self):
+        # passage bits of every cell, without the visited flags
+        return bytes(self.cells).translate(PASSAGES)
+
+    def vectors(self):
+        # list the position of every cell
+        return [self.vector(i) for i in range(len(self.cells))]
+
+    @property
+    def nodes(self):
+        # Node view of every cell, built on demand
+        nodes = []
+        for i, bits in enumerate(self.cells):
+            node = Node(self.vector(i), [self.vector(j) for j in self.passages(i)])
+            if bits & VISITED:
+                node.visited = True
+            nodes.append(node)
+        return nodes
+
+    # ----- conversions -----
+
+    def to_maze(self):
+        '''Return the equivalent Maze of Nodes.'''
+        return Maze(self.nodes)
+
+    @classmethod
+    def from_maze(cls, maze):
+        '''Build a GridMaze from a Maze laid out on a regular grid.'''
+        xs = sorted({node.current.x for node in maze.nodes})
+        ys = sorted({node.current.y for node in maze.nodes})
+        steps = [b - a for a, b in zip(xs, xs[1:])] + [b - a for a, b in zip(ys, ys[1:])]
+        cellsize = min(steps) if steps else 1
+
+        width = (xs[-1] - xs[0]) // cellsize + 1
+        height = (ys[-1] - ys[0]) // cellsize + 1
+        grid = cls(width, height, Vector(xs[0], ys[0]), cellsize)
+
+        for node in maze.nodes:
+            grid.insert_node(node)
+        return grid
+
+    def __str__(self):
+        return f'GridMaze: {self.width} * {self.height} cells'
+
+
 @dataclass
 class Frame:
 
@@ -144,3 +331,43 @@ class Frame:
 
     def __str__(self):
         return f'Frame: \nHead: {self.head} \n{self.maze}'
+
+
+@dataclass
+class DisjointSet:
+    '''Union-find over the integers 0 .. size - 1, with path
+    compression and union by rank.
+    >> sets = DisjointSet(3)
+    >> sets.union(0, 2)
+    True
+    >> sets.find(2) == sets.find(0)
+    True
+    '''
+    size: int
+    parent: list = field(init=False, repr=False)
+    rank: bytearray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.parent = list(range(self.size))
+        self.rank = bytearray(self.size)    # ranks stay below log2(size)
+
+    def find(self, i):
+        # representative of the set of i
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:    # path compression
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i, j):
+        # merge the sets of i and j, False if they were already joined
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return False
+        if self.rank[root_i] < self.rank[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parent[root_j] = root_i
+        if self.rank[root_i] == self.rank[root_j]:
+            self.rank[root_i] += 1
+        return True
@@ -0,0 +1,113 @@
+# Disk-backed tiled cell storage for mazes larger than memory
+# 2026-10-18
+
+import mmap
+import struct
+from collections import OrderedDict
+from Maze.structs import *
+
+
+MAGIC = b'MZTL'
+VERSION = 1
+HEADER = struct.Struct('<4sHIII')    # magic, version, width, height, tile
+HEADER_SIZE = 1 << 16    # tiles start on a boundary mmap accepts on every platform
+
+
+class TiledCells:
+    '''Byte per cell storage of a width * height grid kept in a file of
+    tile * tile blocks. Tiles are memory-mapped on first access and at
+    most max_tiles stay mapped; the least recently used is flushed and
+    unmapped to make room. Indexing is row-major like a bytearray, so
+    it can be used as the cells of a GridMaze.'''
+
+    def __init__(self, path, max_tiles = 64, writable = True):
+        self.file = open(path, 'r+b' if writable else 'rb')
+        magic, version, self.width, self.height, self.tile = HEADER.unpack_from(self.file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError('Not a tiled maze file')
+
+        self.access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        self.max_tiles = max_tiles
+        self.tiles_x = -(-self.width // self.tile)    # tiles per row of tiles
+        self.mapped = OrderedDict()    # tile number -> mmap, in least recently used order
+        self.last = (None, None)       # last tile used, skips the LRU bookkeeping
+
+    @classmethod
+    def create(cls, path, width, height, tile = 256, max_tiles = 64):
+        '''Create a file of blank cells, sparse where the file system allows.'''
+
+        assert tile * tile % mmap.ALLOCATIONGRANULARITY == 0, 'Tiles must be aligned to mmap pages'
+        tiles = -(-width // tile) * -(-height // tile)
+
+        with open(path, 'wb') as output:
+            output.write(HEADER.pack(MAGIC, VERSION, width, height, tile))
+            output.truncate(HEADER_SIZE + tiles * tile * tile)
+        return cls(path, max_tiles)
+
+    def locate(self, index):
+        # (tile number, offset inside the tile) of a cell index
+        if not 0 <= index < self.width * self.height:
+            raise IndexError('cell index out of range')
+        row, col = divmod(index, self.width)
+        tile_row, y = divmod(row, self.tile)
+        tile_col, x = divmod(col, self.tile)
+        return tile_row * self.tiles_x + tile_col, y * self.tile + x
+
+    def load(self, number):
+        # mapped tile, evicting the least recently used one when full
+        if self.last[0] == number:
+            return self.last[1]
+
+        tile = self.mapped.get(number)
+        if tile is None:
+            if len(self.mapped) >= self.max_tiles:
+                _, evicted = self.mapped.popitem(last = False)
+                evicted.close()    # flushes pending writes
+            size = self.tile * self.tile
+            tile = mmap.mmap(self.file.fileno(), size, access = self.access, offset = HEADER_SIZE + number * size)
+            self.mapped[number] = tile
+        else:
+            self.mapped.move_to_end(number)
+
+        self.last = (number, tile)
+        return tile
+
+    def __getitem__(self, index):
+        number, offset = self.locate(index)
+        return self.load(number)[offset]
+
+    def __setitem__(self, index, value):
+        number, offset = self.locate(index)
+        self.load(number)[offset] = value
+
+    def __len__(self):
+        return self.width * self.height
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def flush(self):
+        for tile in self.mapped.values():
+            tile.flush()
+
+    def close(self):
+        for tile in self.mapped.values():
+            tile.close()
+        self.mapped.clear()
+        self.last = (None, None)
+        self.file.close()
+
+
+def create_tiled(path, width, height, tile = 256, max_tiles = 64, origin = None, cellsize = 1):
+    '''Blank GridMaze stored in a new tiled file.'''
+
+    cells = TiledCells.create(path, width, height, tile, max_tiles)
+    return GridMaze(width, height, origin or Vector(0, 0), cellsize, cells)
+
+
+def open_tiled(path, max_tiles = 64, writable = True, origin = None, cellsize = 1):
+    '''GridMaze over an existing tiled file.'''
+
+    cells = TiledCells(path, max_tiles, writable)
+    return GridMaze(cells.width, cells.height, origin or Vector(0, 0), cellsize, cells)
@@ -0,0 +1,79 @@
+# Maze generators vectorized with NumPy over a batch of mazes
+# 2026-10-18
+
+import numpy as np
+from Maze.structs import *
+
+
+def as_generator(seed):
+    '''NumPy Generator from a seed, or the given Generator itself.'''
+
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def passages(north, east):
+    '''Passage bits of mazes where each cell opens north and/or east,
+    with the matching south and west bits on the other cells.'''
+
+    cells = np.where(north, NORTH, 0).astype(np.uint8)
+    cells |= np.where(east, EAST, 0).astype(np.uint8)
+    cells[:, :-1, :] |= np.where(north[:, 1:, :], SOUTH, 0).astype(np.uint8)
+    cells[:, :, 1:] |= np.where(east[:, :, :-1], WEST, 0).astype(np.uint8)
+    return cells
+
+
+def binary_tree(batch, height, width, seed = None):
+    '''Generate batch mazes with the binary tree algorithm: every cell
+    opens towards north or east at random, the top row can only open
+    east and the right column north. Returns the passage bits (NORTH,
+    SOUTH, EAST, WEST) in an array of shape (batch, height, width).'''
+
+    rng = as_generator(seed)
+
+    north = rng.random((batch, height, width)) < 0.5
+    north[:, :, -1] = True
+    north[:, 0, :] = False
+    east = ~north
+    east[:, :, -1] = False
+
+    return passages(north, east)
+
+
+def sidewinder(batch, height, width, seed = None):
+    '''Generate batch mazes with the sidewinder algorithm: rows are cut
+    in runs of cells joined east, and one random cell of each run opens
+    north. The top row is a single run. Returns the passage bits in an
+    array of shape (batch, height, width).'''
+
+    rng = as_generator(seed)
+
+    east = rng.random((batch, height, width)) < 0.5
+    east[:, 0, :] = True
+    east[:, :, -1] = False
+    closing = ~east    # last cell of each run
+    closing[:, 0, :] = False
+
+    # first column of the run of every cell
+    columns = np.arange(width)
+    previous = np.where(closing, columns, -1)
+    previous = np.concatenate([np.full((batch, height, 1), -1), previous[:, :, :-1]], axis = 2)
+    start = np.maximum.accumulate(previous, axis = 2) + 1
+
+    # a random cell of every run opens north
+    b, r, c = np.nonzero(closing)
+    length = c - start[b, r, c] + 1
+    chosen = start[b, r, c] + (rng.random(len(c)) * length).astype(np.intp)
+
+    north = np.zeros((batch, height, width), dtype = bool)
+    north[b, r, chosen] = True
+
+    return passages(north, east)
+
+
+def to_grid(cells, k = 0):
+    '''GridMaze of the k-th maze of a batch.'''
+
+    height, width = cells.shape[1:]
+    return GridMaze(width, height, cells = bytearray(cells[k].tobytes()))
@@ -0,0 +1,53 @@
+# Headless batch mode: generates and solves mazes without
+# opening a window or capturing frames
+# 2026-10-18
+
+import os
+import argparse
+import json
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')   # keep stdout machine-readable
+
+from Maze.algorithms import ALG_GEN, X_CELLS, Y_CELLS
+from Maze.headless import run_headless, print_summary
+from Maze.cache import MazeCache
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = 'Generate and solve mazes without rendering.')
+    parser.add_argument('-n', '--count', type = int, default = 10, help = 'number of mazes')
+    parser.add_argument('-x', '--x-cells', type = int, default = X_CELLS, help = 'horizontal cells')
+    parser.add_argument('-y', '--y-cells', type = int, default = Y_CELLS, help = 'vertical cells')
+    parser.add_argument('-a', '--algorithm', type = int, default = 1, choices = sorted(ALG_GEN),
+                        help = ', '.join(f'{key} - {name}' for key, name in ALG_GEN.items()))
+    parser.add_argument('-s', '--seed', type = int, help = 'seed of the batch, random by default')
+    parser.add_argument('-w', '--workers', type = int, default = 1,
+                        help = 'worker processes, 0 uses every core')
+    parser.add_argument('--cache', metavar = 'DIR', help = 'read and store mazes in an on-disk cache')
+    parser.add_argument('--cache-size', type = int, default = 256, help = 'cache size limit in MB')
+    parser.add_argument('-o', '--output', help = 'write the mazes as JSON lines to this file')
+    parser.add_argument('--mazes', metavar = 'DIR', help = 'write every maze as a binary maze file in this directory')
+    parser.add_argument('--images', metavar = 'DIR', help = 'render every maze as a PNG in this directory')
+    parser.add_argument('--image-cell', type = int, default = 4, help = 'pixels per cell of rendered mazes')
+    parser.add_argument('--json', action = 'store_true', help = 'print the summary as JSON')
+    args = parser.parse_args()
+
+    if args.count < 1:
+        parser.error('count must be at least 1')
+    if args.x_cells < 1 or args.y_cells < 1:
+        parser.error('x-cells and y-cells must be at least 1')
+    if args.image_cell < 2:
+        parser.error('image-cell must be at least 2 pixels')
+    if args.workers < 0:
+        parser.error('workers must be at least 0, 0 for every core')
+
+    cache = MazeCache(args.cache, args.cache_size * 2 ** 20) if args.cache else None
+
+    summary = run_headless(args.count, args.x_cells, args.y_cells, args.algorithm, args.output,
+                           args.images, args.image_cell, args.seed, args.workers or None, cache, args.mazes)
+
+    if args.json:
+        print(json.dumps(summary, indent = 2))
+    else:
+        print_summary(summary)
@@ -0,0 +1,50 @@
+# Benchmark harness: times the generators and solvers over a sweep
+# of grid sizes and compares the results with a stored baseline
+# 2026-10-18
+
+import os
+import sys
+import json
+import argparse
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')   # keep stdout machine-readable
+
+from Maze.benchmark import BENCHMARKS, SIZES, REPEATS, SEED, THRESHOLD, run_benchmarks, compare, print_result
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = 'Time maze generators and solvers.')
+    parser.add_argument('names', nargs = '*', metavar = 'NAME',
+                        help = 'benchmarks to run, all by default: ' + ', '.join(BENCHMARKS))
+    parser.add_argument('--sizes', type = int, nargs = '+', default = SIZES, help = 'cells per side of the grids')
+    parser.add_argument('-r', '--repeats', type = int, default = REPEATS, help = 'timed runs per benchmark and size')
+    parser.add_argument('-s', '--seed', type = int, default = SEED, help = 'seed of every run')
+    parser.add_argument('--no-memory', action = 'store_true', help = 'skip the tracemalloc run')
+    parser.add_argument('-o', '--output', help = 'write the results as JSON to this file')
+    parser.add_argument('-b', '--baseline', help = 'compare with the JSON results of a previous run')
+    parser.add_argument('-t', '--threshold', type = float, default = THRESHOLD,
+                        help = 'relative growth reported as a regression')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error('unknown benchmarks: ' + ', '.join(unknown))
+    if args.repeats < 1:
+        parser.error('repeats must be at least 1')
+
+    report = run_benchmarks(args.names, args.sizes, args.repeats, args.seed, not args.no_memory, print_result)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent = 2)
+
+    if args.baseline:
+        with open(args.baseline) as source:
+            regressions = compare(report, json.load(source), args.threshold)
+        for result, metric, ratio in regressions:
+            print(f"REGRESSION {result['name']} {result['x_cells']} * {result['y_cells']}: "
+                  f"{metric} {ratio:.2f}x the baseline")
+        if regressions:
+            sys.exit(1)
+        print('No regressions against', args.baseline)
@@ -1,5 +1,6 @@
 # A maze generator and solver implemented with
-# Depth-First Search, Randomized Prim and A* search
+# Depth-First Search, Randomized Prim, Kruskal,
+# Eller and A* search
 # 2021-09-19
 
 import os, shutil
@@ -11,6 +12,9 @@ if __name__ == '__main__':
     # 0 - View settings
     # 1 - Depth-first search
     # 2 - Prim
+    # 3 - Kruskal
+    # 4 - Eller
+    # 5 - Growing tree
     algorithm = 2
 
     # clean up previous output